@@ -0,0 +1,2735 @@
+# Imports. Only what the solvers need is imported here; multiprocessing, sqlite3, the profilers, argparse and the
+# other modules used by a single command are imported inside the functions that use them, so importing is cheap.
+import random
+import sys
+import heapq
+import itertools
+import math
+import mmap
+import os
+import stat
+import io
+import time
+import contextlib
+import functools
+from collections import OrderedDict, deque
+
+try:
+    import resource  # Peak RSS; not available on Windows
+except ImportError:
+    resource = None
+
+# Goal configuration of the board, blank (0) in the top-left corner
+GOAL_STATE = [0, 1, 2, 3, 4, 5, 6, 7, 8]
+
+# Blank moves in the order the solvers expand them; a move is stored as its index (2 bits)
+MOVES = ('left', 'right', 'up', 'down')
+
+# Index of the move that undoes each move in MOVES
+OPPOSITE_MOVES = (1, 0, 3, 2)
+
+# Index of each move in MOVES after transposing the board (left <-> up, right <-> down)
+TRANSPOSED_MOVES = (2, 3, 0, 1)
+
+# Packed state encoding: tile at board index i lives in bits [bits*i, bits*i + bits) of an int.
+# The 3x3 board uses 4 bits per tile (36 bits total); larger boards pick their width in PuzzleGeometry.
+TILE_BITS = 4
+TILE_MASK = (1 << TILE_BITS) - 1
+
+
+# Pack a board list into a single integer
+def encode_state(state, bits=TILE_BITS):
+    code = 0
+    for i, tile in enumerate(state):
+        code |= tile << (bits * i)
+    return code
+
+
+# Unpack an integer produced by encode_state back into a board list
+def decode_state(code, size=9, bits=TILE_BITS):
+    mask = (1 << bits) - 1
+    return [(code >> (bits * i)) & mask for i in range(size)]
+
+
+# Slide the tile at new_blank into the blank slot without unpacking (the blank slot holds 0)
+def swap_blank_code(code, blank, new_blank, bits=TILE_BITS):
+    tile = (code >> (bits * new_blank)) & ((1 << bits) - 1)
+    return code + (tile << (bits * blank)) - (tile << (bits * new_blank))
+
+
+GOAL_CODE = encode_state(GOAL_STATE)
+
+
+# Build the successor table: for each blank index, the (move index, new blank index) pairs in MOVES order
+def build_neighbor_table(rows=3, cols=3):
+    table = []
+    for i in range(rows * cols):
+        row, col = divmod(i, cols)
+        targets = {
+            'left': i - 1 if col > 0 else None,
+            'right': i + 1 if col < cols - 1 else None,
+            'up': i - cols if row > 0 else None,
+            'down': i + cols if row < rows - 1 else None
+        }
+        table.append(tuple((move_index, targets[move]) for move_index, move in enumerate(MOVES)
+                           if targets[move] is not None))
+    return tuple(table)
+
+
+NEIGHBORS = build_neighbor_table()
+
+
+# Build per-tile heuristic tables: table[tile][i] is the tile's contribution when it sits at board index i.
+# A heuristic value is the sum over tiles, so a move changes it by a single table difference.
+def build_heuristic_tables(rows=3, cols=3):
+    size = rows * cols
+    misplaced = [[0 if tile == 0 or tile == i else 1 for i in range(size)] for tile in range(size)]
+    manhattan = [[0 if tile == 0 else abs(tile // cols - i // cols) + abs(tile % cols - i % cols)
+                  for i in range(size)] for tile in range(size)]
+    return {'h1': misplaced, 'h2': manhattan}
+
+
+HEURISTIC_TABLES = build_heuristic_tables()
+
+# Largest board setSize accepts (8x8 or any other shape with as many squares): the per-tile heuristic tables grow
+# with the square of the board, and larger boards are far beyond what the solvers can search anyway
+MAX_BOARD_SQUARES = 64
+
+
+# Size-dependent tables for a rows x cols board: goal, packed-state layout, successor and heuristic tables
+class PuzzleGeometry:
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self.size = rows * cols
+        self.goal_state = list(range(self.size))
+        # Enough bits for the largest tile, at least 4: 36 bits for 3x3, 64 for 4x4, 125 for 5x5
+        self.tile_bits = max(TILE_BITS, (self.size - 1).bit_length())
+        self.tile_mask = (1 << self.tile_bits) - 1
+        self.goal_code = encode_state(self.goal_state, self.tile_bits)
+        self.neighbors = build_neighbor_table(rows, cols)
+        self.heuristic_tables = build_heuristic_tables(rows, cols)
+
+    # The pattern databases and the distance oracle only exist for the 3x3 board
+    @property
+    def is_eight_puzzle(self):
+        return self.rows == 3 and self.cols == 3
+
+
+_geometries = {}
+
+
+# Get the shared geometry for a board size, building it the first time the size is used
+def puzzle_geometry(rows, cols):
+    if (rows, cols) not in _geometries:
+        _geometries[(rows, cols)] = PuzzleGeometry(rows, cols)
+    return _geometries[(rows, cols)]
+
+
+# Additive disjoint pattern databases (heuristic "pdb"): each group's table stores, for every placement of
+# its tiles and every blank index, the fewest moves of those tiles needed to reach the goal. Sums across disjoint
+# groups stay admissible, and keeping the blank in the abstraction makes the sum consistent: a move changes one
+# group's entry by at most 1 and leaves the other's unchanged (the blank swapping with a non-group tile is free).
+PDB_GROUPS = ((1, 2, 3, 4), (5, 6, 7, 8))
+PDB_GROUP_SIZE = 9 ** 4  # a group placement is indexed as sum(position of k-th tile * 9**k)
+PDB_TABLE_SIZE = PDB_GROUP_SIZE * 9  # one placement table per blank index: entry placement + blank * PDB_GROUP_SIZE
+PDB_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "8puzzle_pdb.bin")
+PDB_UNSEEN = 255
+
+_pattern_database = None
+
+
+# Build one group's table with a 0-1 BFS from the goal over (tile placement, blank index);
+# moving a group tile costs 1, moving any other tile is free
+def build_pattern_table(group):
+    weights = [9 ** k for k in range(len(group))]
+    distances = bytearray([PDB_UNSEEN]) * PDB_TABLE_SIZE
+    start = sum(tile * weight for tile, weight in zip(group, weights))  # blank index 0 adds nothing
+    distances[start] = 0
+    queue = deque([start])
+
+    while queue:
+        key = queue.popleft()
+        placement, blank_index = key % PDB_GROUP_SIZE, key // PDB_GROUP_SIZE
+        distance = distances[key]
+        positions = [(placement // weight) % 9 for weight in weights]
+
+        for _, new_blank_index in NEIGHBORS[blank_index]:
+            if new_blank_index in positions:
+                # A group tile slides from new_blank_index into blank_index
+                weight = weights[positions.index(new_blank_index)]
+                new_key = placement + (blank_index - new_blank_index) * weight + new_blank_index * PDB_GROUP_SIZE
+                new_distance = distance + 1
+            else:
+                new_key = placement + new_blank_index * PDB_GROUP_SIZE
+                new_distance = distance
+
+            if new_distance < distances[new_key]:
+                distances[new_key] = new_distance
+                if new_distance == distance:
+                    queue.appendleft(new_key)
+                else:
+                    queue.append(new_key)
+
+    # Entries where the blank sits on a group tile are never reached and stay PDB_UNSEEN
+    return bytes(distances)
+
+
+# Memory-map a saved byte table, or build it with build() and save it first when the file is missing or stale.
+# The table is written to a temporary file and renamed into place, so another process that has the old file mapped
+# keeps its copy, and no process ever sees a partly written table under the final name.
+def load_table_file(path, expected_size, build, rebuild=False):
+    if rebuild or not os.path.exists(path) or os.path.getsize(path) != expected_size:
+        data = build()
+        temporary = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(temporary, "wb") as file:
+                file.write(data)
+            os.replace(temporary, path)
+        except OSError:
+            # Read-only location: keep the freshly built table in memory only
+            with contextlib.suppress(OSError):
+                os.remove(temporary)
+            return data
+
+    with open(path, "rb") as file:
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+# Load the pattern databases, memory-mapping the saved file or building and saving it on first use
+def load_pattern_database(path=PDB_FILE):
+    global _pattern_database
+    if _pattern_database is None:
+        _pattern_database = load_table_file(
+            path, PDB_TABLE_SIZE * len(PDB_GROUPS),
+            lambda: b"".join(build_pattern_table(group) for group in PDB_GROUPS))
+    return _pattern_database
+
+
+# Per-tile key table for the "pdb" heuristic: the key packs both group placements into one integer
+# (first group in the high part), so it is updated incrementally just like the h1/h2 sums. The blank index is
+# passed to the lookup separately.
+def build_pattern_key_table():
+    table = [[0] * 9 for _ in range(9)]
+    for group_index, group in enumerate(PDB_GROUPS):
+        scale = PDB_GROUP_SIZE ** (len(PDB_GROUPS) - 1 - group_index)
+        for k, tile in enumerate(group):
+            table[tile] = [i * 9 ** k * scale for i in range(9)]
+    return table
+
+
+PDB_KEY_TABLE = build_pattern_key_table()
+
+
+# Solvability test in O(n) using parity. Every move swaps the blank with one tile, which flips the
+# permutation's parity and moves the blank one step. So a board is solvable exactly when the permutation parity
+# (found by counting cycles) matches the parity of the blank's Manhattan distance from its goal index 0.
+def is_solvable(state, cols=3):
+    n = len(state)
+    seen = [False] * n
+    cycles = 0
+    for i in range(n):
+        if not seen[i]:
+            cycles += 1
+            j = i
+            while not seen[j]:
+                seen[j] = True
+                j = state[j]
+    blank_index = state.index(0)
+    return (n - cycles) % 2 == (blank_index // cols + blank_index % cols) % 2
+
+
+# Rank a board as a permutation (Lehmer code), giving a dense index in [0, 9!)
+def rank_state(state):
+    rank = 0
+    n = len(state)
+    for i in range(n):
+        smaller = 0
+        for j in range(i + 1, n):
+            if state[j] < state[i]:
+                smaller += 1
+        rank = rank * (n - i) + smaller
+    return rank
+
+
+# Inverse of rank_state
+def unrank_state(rank, size=9):
+    digits = []
+    for radix in range(1, size + 1):
+        rank, digit = divmod(rank, radix)
+        digits.append(digit)
+    remaining = list(range(size))
+    return [remaining.pop(digit) for digit in reversed(digits)]
+
+
+# Distance oracle: optimal solution length of every board, stored as one byte per permutation rank
+ORACLE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "8puzzle_oracle.bin")
+ORACLE_SIZE = math.factorial(9)
+ORACLE_UNREACHABLE = 255
+
+_distance_oracle = None
+
+
+# Run one BFS from the goal over the whole reachable space (181,440 states) and record every distance
+def build_distance_oracle():
+    distances = {GOAL_CODE: 0}
+    layer = [(GOAL_CODE, 0)]
+    depth = 0
+
+    while layer:
+        depth += 1
+        next_layer = []
+        for code, blank_index in layer:
+            for _, new_blank_index in NEIGHBORS[blank_index]:
+                new_code = swap_blank_code(code, blank_index, new_blank_index)
+                if new_code not in distances:
+                    distances[new_code] = depth
+                    next_layer.append((new_code, new_blank_index))
+        layer = next_layer
+
+    oracle = bytearray([ORACLE_UNREACHABLE]) * ORACLE_SIZE
+    for code, distance in distances.items():
+        oracle[rank_state(decode_state(code))] = distance
+    return bytes(oracle)
+
+
+# Load the distance oracle, memory-mapping the saved file or building and saving it on first use
+def load_distance_oracle(path=ORACLE_FILE, rebuild=False):
+    global _distance_oracle
+    if _distance_oracle is None or rebuild:
+        # Release the old mapping; the rebuilt table replaces its file
+        if isinstance(_distance_oracle, mmap.mmap):
+            _distance_oracle.close()
+        _distance_oracle = load_table_file(path, ORACLE_SIZE, build_distance_oracle, rebuild)
+    return _distance_oracle
+
+
+# Peak resident set size of this process in bytes, or None where the platform does not report it
+def peak_rss():
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024  # ru_maxrss is in KB on Linux
+
+
+# Mirror a square board in its main diagonal. Tiles are relabelled the same way, so the goal maps to itself
+# and a solution for the transposed board is the original solution with every move swapped by TRANSPOSED_MOVES.
+def transpose_state(state, n):
+    transposed = [0] * len(state)
+    for i, tile in enumerate(state):
+        row, col = divmod(i, n)
+        tile_row, tile_col = divmod(tile, n)
+        transposed[col * n + row] = tile_col * n + tile_row
+    return transposed
+
+
+# Default weight for solve WA* (and algo=WA* in solveBatch)
+WA_STAR_WEIGHT = 2.0
+
+# Benchmark instance sets: seeded scrambles bucketed by optimal depth (from the distance oracle), plus the hardest states
+BENCHMARK_DEPTH_BANDS = ((1, 8), (9, 16), (17, 22), (23, 26), (27, 30))
+
+# The only two 8-puzzle states 31 moves from the goal, the maximum distance (found with the distance oracle)
+HARDEST_STATES = ([8, 0, 6, 5, 4, 7, 2, 3, 1], [8, 7, 6, 0, 4, 1, 2, 5, 3])
+
+# Solvers run by the benchmark: name -> (algorithm, heuristic, max nodes)
+BENCHMARK_SOLVERS = {
+    "BFS": ('BFS', 'h1', 200000),
+    "BiBFS": ('BiBFS', 'h1', 200000),
+    "A*(h1)": ('A*', 'h1', 200000),
+    "A*(h2)": ('A*', 'h2', 200000),
+    "A*(pdb)": ('A*', 'pdb', 200000),
+    "WA*(h2)": ('WA*', 'h2', 200000),
+    "IDA*(h2)": ('IDA*', 'h2', 10000000),
+    "IDA*(pdb)": ('IDA*', 'pdb', 10000000),
+}
+
+# solveBatch: most states per chunk, and chunks kept in flight per worker process (bounds memory on large inputs)
+BATCH_CHUNK_SIZE = 64
+BATCH_CHUNKS_PER_WORKER = 4
+
+# Default number of solutions kept in memory by SolutionCache
+SOLUTION_CACHE_SIZE = 1024
+
+
+# LRU cache of solutions: key -> (move indices as a digit string, nodes expanded, nodes generated, transposed).
+# transposed records which orientation of the board was searched (None for rows from files written before it was
+# stored), since the node counts only hold for that orientation. Hits through the transpose are used only when
+# symmetry folding is switched on; otherwise they count as misses.
+# With a file it also writes every solution to sqlite and falls back to it on a memory miss, so solutions
+# survive across runs and can be shared by several processes.
+class SolutionCache:
+    def __init__(self, capacity=SOLUTION_CACHE_SIZE, path=None):
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.symmetry = False  # Fold a square board and its transpose into one entry (setCache symmetry=on)
+        self.path = None
+        self.connection = None
+        if path:
+            self.open(path)
+
+    # Attach a sqlite file (created if missing); solutions already in memory are not copied to it
+    def open(self, path):
+        import sqlite3
+
+        self.close()
+        self.connection = sqlite3.connect(path)
+        # Write-ahead logging with synchronous=NORMAL: a put's commit appends to the log without a disk sync (the log
+        # is synced at checkpoints), and readers in other processes are never blocked by a writer
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("CREATE TABLE IF NOT EXISTS solutions (key TEXT PRIMARY KEY, moves TEXT, "
+                                "nodes_expanded INTEGER, nodes_generated INTEGER, transposed INTEGER)")
+        columns = [row[1] for row in self.connection.execute("PRAGMA table_info(solutions)")]
+        if "transposed" not in columns:
+            self.connection.execute("ALTER TABLE solutions ADD COLUMN transposed INTEGER")  # Older files
+        self.connection.commit()
+        self.path = path
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+        self.connection = None
+        self.path = None
+
+    # Look a key up for a board in the given orientation. Entries whose search expanded more than max_nodes count as
+    # misses, so a hit never succeeds where running the solver with the same budget would have given up. Entries
+    # searched in the other orientation count as misses unless symmetry folding is on; then the budget is checked
+    # against the node count of the search that filled the entry.
+    def get(self, key, max_nodes=None, transposed=False):
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+        elif self.connection is not None:
+            row = self.connection.execute("SELECT moves, nodes_expanded, nodes_generated, transposed FROM solutions "
+                                          "WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                moves, nodes_expanded, nodes_generated, stored = row
+                entry = (moves, nodes_expanded, nodes_generated, None if stored is None else bool(stored))
+                self._remember(key, entry)
+        if (entry is None or (entry[3] != transposed and not self.symmetry)
+                or (max_nodes is not None and entry[1] > max_nodes)):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def put(self, key, entry):
+        self._remember(key, entry)
+        if self.connection is not None:
+            self.connection.execute("INSERT OR REPLACE INTO solutions VALUES (?, ?, ?, ?, ?)", (key, *entry))
+            self.connection.commit()
+
+    def _remember(self, key, entry):
+        if self.capacity <= 0:
+            return
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)  # Evict the least recently used solution
+
+    def resize(self, capacity):
+        self.capacity = capacity
+        while len(self.entries) > max(capacity, 0):
+            self.entries.popitem(last=False)
+
+    # Drop every solution (including the file's) and reset the counters
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+        if self.connection is not None:
+            self.connection.execute("DELETE FROM solutions")
+            self.connection.commit()
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+# Open list for small non-negative integer priorities: buckets[f][g] is a FIFO of entries. pop() returns an entry
+# with the lowest f, the highest g among those and the earliest pushed among those, the same order as A*'s heap
+# entries (f, -g, counter), but push and pop cost O(1) amortized instead of O(log n).
+class BucketQueue:
+    def __init__(self):
+        self.buckets = []
+        self.top_g = []  # Highest non-empty g per f bucket, -1 when the bucket is empty
+        self.f_min = 0   # No entry has a smaller f
+        self.size = 0
+
+    def push(self, f, g, entry):
+        while len(self.buckets) <= f:
+            self.buckets.append([])
+            self.top_g.append(-1)
+        row = self.buckets[f]
+        while len(row) <= g:
+            row.append(deque())
+        row[g].append(entry)
+        if g > self.top_g[f]:
+            self.top_g[f] = g
+        if f < self.f_min:
+            self.f_min = f  # Only possible with an inconsistent (e.g. weighted) heuristic
+        self.size += 1
+
+    def pop(self):
+        if not self.size:
+            raise IndexError("pop from an empty BucketQueue")
+        f = self.f_min
+        while self.top_g[f] < 0:
+            f += 1
+        self.f_min = f
+        row = self.buckets[f]
+        g = self.top_g[f]
+        entry = row[g].popleft()
+        top = g
+        while top >= 0 and not row[top]:
+            top -= 1
+        self.top_g[f] = top
+        self.size -= 1
+        return f, g, entry
+
+    def __len__(self):
+        return self.size
+
+
+# Per-phase wall-clock totals for the solver loops (frontier pop, visited, successors, heuristic, frontier push,
+# bookkeeping). Timed solver copies call lap() after each phase (see instrument_phases); the time since the previous
+# lap is charged to that phase.
+# Timing adds overhead of its own, so the shares are more telling than the absolute times.
+class PhaseTimer:
+    def __init__(self):
+        self.totals = {}
+        self.counts = {}
+        self.last = time.perf_counter()
+
+    def start(self):
+        self.last = time.perf_counter()
+
+    def lap(self, phase):
+        now = time.perf_counter()
+        self.totals[phase] = self.totals.get(phase, 0.0) + now - self.last
+        self.counts[phase] = self.counts.get(phase, 0) + 1
+        self.last = now
+
+    # Rows of (phase, seconds, laps, share of the timed total, nanoseconds per lap), slowest phase first
+    def report(self):
+        total = sum(self.totals.values()) or 1.0
+        return [(phase, round(seconds, 6), self.counts[phase], f"{seconds / total:.1%}",
+                 round(seconds / self.counts[phase] * 1e9))
+                for phase, seconds in sorted(self.totals.items(), key=lambda item: -item[1])]
+
+
+# Compile a copy of a solver with PhaseTimer laps added where its source is tagged, so the solver itself keeps a
+# single loop with no timing hooks. "# phase: <name>" after the first line of a statement laps <name> once the whole
+# statement has run; "# phase test: <name>" after an if header laps once its condition has been evaluated; a line
+# holding only "# phase: start" starts the timer before the next statement.
+def instrument_phases(function):
+    import ast
+    import inspect
+    import textwrap
+    import tokenize
+
+    lines, first_line = inspect.getsourcelines(function)
+    source = textwrap.dedent(''.join(lines))
+    laps, tests, starts = {}, {}, set()
+    for token in tokenize.generate_tokens(io.StringIO(source).readline):
+        if token.type != tokenize.COMMENT:
+            continue
+        line = token.start[0]
+        if token.string == "# phase: start" and token.line.strip() == token.string:
+            starts.add(line + 1)
+        elif token.string.startswith("# phase: "):
+            laps[line] = token.string[len("# phase: "):]
+        elif token.string.startswith("# phase test: "):
+            tests[line] = token.string[len("# phase test: "):]
+
+    def call(method, *args):
+        return ast.Expr(ast.Call(ast.Attribute(ast.Name("timer", ast.Load()), method, ast.Load()),
+                                 [ast.Constant(arg) for arg in args], []))
+
+    def instrument(statements):
+        result = []
+        for statement in statements:
+            for field in ("body", "orelse", "finalbody"):
+                if isinstance(getattr(statement, field, None), list):
+                    setattr(statement, field, instrument(getattr(statement, field)))
+            if statement.lineno in starts:
+                result.append(call("start"))
+            if isinstance(statement, ast.If) and statement.test.end_lineno in tests:
+                result.append(ast.Assign([ast.Name("_phase_test", ast.Store())], statement.test))
+                result.append(call("lap", tests[statement.test.end_lineno]))
+                statement.test = ast.Name("_phase_test", ast.Load())
+            result.append(statement)
+            if statement.lineno in laps:
+                result.append(call("lap", laps.pop(statement.lineno)))  # pop: only the outermost statement laps
+        return result
+
+    tree = ast.parse(source)
+    definition = tree.body[0]
+    definition.decorator_list = []
+    timer = ast.parse("timer = self.phase_timer").body[0]
+    definition.body = [timer] + instrument(definition.body)
+    ast.increment_lineno(tree, first_line - 1)
+    ast.fix_missing_locations(tree)
+    namespace = {}
+    exec(compile(tree, inspect.getsourcefile(function), "exec"), function.__globals__, namespace)
+    return namespace[function.__name__]
+
+
+# Decorator for solver methods: while self.phase_timer is set, calls go to a copy of the method instrumented with
+# instrument_phases (compiled on first use); otherwise the method runs as written
+def phase_timed(function):
+    timed = None
+
+    @functools.wraps(function)
+    def solver(self, *args, **kwargs):
+        nonlocal timed
+        if self.phase_timer is None:
+            return function(self, *args, **kwargs)
+        if timed is None:
+            timed = instrument_phases(function)
+        return timed(self, *args, **kwargs)
+
+    return solver
+
+
+# Sampling profiler: a background thread records the main thread's Python stack every `interval` seconds and
+# counts identical stacks, giving the collapsed-stack format read by flamegraph.pl and speedscope
+class StackSampler:
+    def __init__(self, interval=0.001):
+        import threading
+
+        self.interval = interval
+        self.samples = {}
+        self._target = threading.main_thread().ident
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        import threading
+
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(self.interval)  # Let the sampler get the GIL about once per interval
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        sys.setswitchinterval(self._switch_interval)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            if stack:
+                key = ';'.join(reversed(stack))
+                self.samples[key] = self.samples.get(key, 0) + 1
+
+    # Write one "frame;frame;frame count" line per distinct stack
+    def write_collapsed(self, path):
+        with open(path, 'w') as file:
+            for stack, count in sorted(self.samples.items()):
+                file.write(f"{stack} {count}\n")
+
+
+# Outcome and instrumentation of one solver run. Iterating gives (move_sequence, nodes_created) and the result is
+# truthy only when a solution was found, so it can be used like the (moves, nodes) / False values solvers returned before.
+class SearchResult:
+    def __init__(self, algorithm, move_sequence, nodes_expanded, nodes_generated, duplicates_skipped=0,
+                 peak_frontier=0, peak_visited=0, wall_time=0.0):
+        self.algorithm = algorithm
+        self.solved = move_sequence is not None
+        self.move_sequence = move_sequence if move_sequence is not None else []
+        self.nodes_expanded = nodes_expanded        # nodes taken off the frontier and expanded ("nodes created")
+        self.nodes_generated = nodes_generated      # nodes put on the frontier, including the start
+        # Both counts are None for a solution cached from the transposed board, which this run did not search
+        self.duplicates_skipped = duplicates_skipped
+        self.peak_frontier = peak_frontier
+        self.peak_visited = peak_visited
+        self.wall_time = wall_time
+        self.peak_traced_memory = None              # bytes, only when run with track_memory=True
+        self.peak_rss = None                        # bytes, whole process
+        self.unsolvable = False                     # rejected by the parity check before searching
+        self.error = None                           # why no solution was returned, e.g. "maxnodes limit (N) reached"
+        self.improvements = []                      # ARA*: (weight, solution length, nodes) per improved solution
+        self.suboptimality_bound = None             # ARA*: the solution is within this factor of optimal
+
+    @property
+    def nodes_created(self):
+        return self.nodes_expanded
+
+    @property
+    def nodes_per_second(self):
+        return self.nodes_generated / self.wall_time if self.nodes_generated and self.wall_time > 0 else 0.0
+
+    def __iter__(self):
+        return iter((self.move_sequence, self.nodes_created))
+
+    def __getitem__(self, index):
+        return (self.move_sequence, self.nodes_created)[index]
+
+    def __bool__(self):
+        return self.solved
+
+    # The text the command interpreter shows for this result: the solution in the standard format (ARA* first
+    # lists each improvement and the bound) or the error message
+    def report(self, prefix="move "):
+        lines = [f"Weight {weight:g}: solution length {length} after {nodes} nodes"
+                 for weight, length, nodes in self.improvements]
+        if self.solved:
+            if self.suboptimality_bound is not None:
+                lines.append(f"Suboptimality bound: {self.suboptimality_bound:g}")
+            nodes = "unknown (cached from the transposed board)" if self.nodes_created is None else self.nodes_created
+            lines += [f"Nodes created during search: {nodes}",
+                      f"Solution length: {len(self.move_sequence)}", "Move sequence:"]
+            lines.extend(prefix + move for move in self.move_sequence)
+        elif self.error:
+            lines.append(f"Error: {self.error}")
+        return '\n'.join(lines)
+
+    def __repr__(self):
+        return (f"SearchResult({self.algorithm}, solved={self.solved}, length={len(self.move_sequence)}, "
+                f"expanded={self.nodes_expanded}, generated={self.nodes_generated}, time={self.wall_time:.6f}s)")
+
+
+class SlidingPuzzle:
+    # This method is to initialize the puzzle to the default solved state
+    def __init__(self, rows=3, cols=3):
+        self.set_size(rows, cols)
+        self.rng = random.Random()
+        self.solution_cache = SolutionCache()
+        self.phase_timer = None  # A PhaseTimer here makes BFS, DFS and A* run copies that time each loop phase
+
+    # This method changes the board to rows x cols and resets it to the solved state
+    def set_size(self, rows, cols):
+        if rows < 2 or cols < 2:
+            print("Error! Invalid size. The board needs at least 2 rows and 2 columns")
+            return False
+        if rows * cols > MAX_BOARD_SQUARES:
+            print(f"Error! Invalid size. The board can have at most {MAX_BOARD_SQUARES} squares (e.g. 8x8)")
+            return False
+        self.geometry = puzzle_geometry(rows, cols)
+        self.rows, self.cols, self.size = rows, cols, rows * cols
+        self.state = self.geometry.goal_state.copy()
+        return True
+    
+    # This method set the state of the 8-puzzle to a new passed state
+    def set_state(self, new_state):
+        if len(new_state) != self.size:
+            print("Error! Invalid input state. Too few or too many arguments")
+            return False
+        if sorted(new_state) != self.geometry.goal_state:
+            print(f"Error! Invalid input state. Tiles must be a permutation of 0-{self.size - 1}")
+            return False
+        self.state = new_state
+        return True
+    
+    
+    
+    # This method is used to print the code as a rows x cols matrix
+    def print_state(self):
+        width = len(str(self.size - 1))
+        for i in range(0, self.size, self.cols):
+            print(' | '.join(str(tile).rjust(width) for tile in self.state[i:i + self.cols]))
+            if i < self.size - self.cols:  # Add a line after every row except the last
+             print('-' * (self.cols * (width + 3) - 3))
+
+    # Helper Method to find the index of the empty tile
+    def find_blank(self):
+        #Find the index of the blank tile (0)
+        return self.state.index(0)
+    
+    # Helper Method to find where the blank lands after a move, or None if the move is off the board
+    def _move_target(self, blank_index, direction):
+        for move_index, new_index in self.geometry.neighbors[blank_index]:
+            if MOVES[move_index] == direction:
+                return new_index
+        return None
+
+    # This command moves the tiles if it is a valid move
+    def move(self, direction):
+        #Move the blank tile in the specified direction
+        blank_index = self.find_blank()
+        new_index = self._move_target(blank_index, direction)
+        if new_index is None:
+            print("Error: Invalid move")
+            return False
+
+        # Swap blank with adjacent tile
+        self.state[blank_index], self.state[new_index] = self.state[new_index], self.state[blank_index]
+        return True
+
+    # This helper method sets the seed
+    def set_seed(self, seed):
+        #Set the random number generator seed
+        self.rng.seed(seed)
+    
+    # Scramble the puzzle state with n random moves. Retry invalid moves silently.
+    def scramble_state(self, n):
+        
+        self.state = self.geometry.goal_state.copy()  # Reset to goal state
+        possible_moves = ['up', 'down', 'left', 'right']
+        blank_index = 0
+
+        for _ in range(n):
+            for _ in range(10):  # Retry up to 10 times for a valid move
+                move = self.rng.choice(possible_moves)
+                new_index = self._move_target(blank_index, move)
+                if new_index is not None:
+                    self.state[blank_index], self.state[new_index] = self.state[new_index], 0
+                    blank_index = new_index
+                    break
+
+    # This method returns a generator of `count` scrambled states and leaves the board alone. mode="walk" makes n
+    # random blank moves from the goal that never undo the previous move, so each walk really is n moves long;
+    # mode="uniform" draws uniformly random solvable states (n is ignored). seed=None uses the puzzle's own generator.
+    def scramble_many(self, count, n=0, seed=None, mode="walk"):
+        rng = self.rng if seed is None else random.Random(seed)
+        if mode == "walk":
+            return self._random_walks(count, n, rng)
+        if mode == "uniform":
+            return self._uniform_states(count, rng)
+        raise ValueError(f"Invalid scramble mode: {mode}")
+
+    # This helper method yields random walks of n moves from the goal that never reverse the previous move
+    def _random_walks(self, count, n, rng):
+        # choices[blank index][banned move + 1]: the (move index, new blank index) pairs allowed after a move
+        choices = [[tuple(entry for entry in moves if entry[0] != banned) for banned in range(-1, len(MOVES))]
+                   for moves in self.geometry.neighbors]
+        goal_state = self.geometry.goal_state
+        random_float = rng.random
+        for _ in range(count):
+            state = goal_state.copy()
+            blank_index = 0
+            banned_move = -1
+            for _ in range(n):
+                allowed = choices[blank_index][banned_move + 1]
+                move_index, new_blank_index = allowed[int(random_float() * len(allowed))]
+                state[blank_index], state[new_blank_index] = state[new_blank_index], 0
+                blank_index = new_blank_index
+                banned_move = OPPOSITE_MOVES[move_index]
+            yield state
+
+    # This helper method yields uniformly random solvable states: a random permutation, with two tiles swapped when
+    # it is unsolvable. The swap flips the permutation parity without moving the blank and pairs every unsolvable
+    # state with exactly one solvable state, so the result stays uniform.
+    def _uniform_states(self, count, rng):
+        goal_state = self.geometry.goal_state
+        for _ in range(count):
+            state = goal_state.copy()
+            rng.shuffle(state)
+            if not is_solvable(state, self.cols):
+                first, second = [i for i, tile in enumerate(state) if tile != 0][:2]
+                state[first], state[second] = state[second], state[first]
+            yield state
+
+    # This helper method rebuilds the move sequence by following parent links back from the goal
+    def _reconstruct_path(self, parents, code):
+        move_sequence = []
+        link = parents[code]
+        while link >= 0:
+            move_sequence.append(MOVES[link & 3])
+            link = parents[link >> 2]
+        move_sequence.reverse()
+        return move_sequence
+
+    # This method returns the text shown for a solver result (BFS lists its moves without the "move " prefix)
+    def format_result(self, result):
+        return result.report(prefix="" if result.algorithm == "BFS" else "move ")
+
+    # This method prints a solver result in the standard format and passes it on. The solvers themselves never print,
+    # so they can be embedded without stdout side effects; the command interpreter reports through here.
+    def print_result(self, result):
+        text = self.format_result(result)
+        if text:
+            print(text)  # One write for the whole block instead of one print per move
+        return result
+
+    # This helper method returns the per-tile table for a heuristic and, for table-backed heuristics,
+    # the lookup(key, blank index) that turns the summed key into a heuristic value (None means the sum is the value)
+    def _heuristic(self, heuristic):
+        if heuristic in self.geometry.heuristic_tables:
+            return self.geometry.heuristic_tables[heuristic], None
+        if heuristic == "pdb" and self.geometry.is_eight_puzzle:
+            pdb = load_pattern_database()
+
+            def lookup(key, blank_index):
+                first, second = divmod(key, PDB_GROUP_SIZE)
+                offset = blank_index * PDB_GROUP_SIZE
+                return pdb[offset + first] + pdb[PDB_TABLE_SIZE + offset + second]
+
+            return PDB_KEY_TABLE, lookup
+        raise ValueError(f"Invalid heuristic: {heuristic}")
+
+    # This helper method starts the clock (and tracemalloc when asked) for a solver run
+    def _begin_search(self, track_memory=False):
+        tracing = False
+        if track_memory:
+            import tracemalloc
+
+            tracing = not tracemalloc.is_tracing()
+            if tracing:
+                tracemalloc.start()
+        return time.perf_counter(), tracing
+
+    # This helper method packages a solver's counters into a SearchResult (move_sequence None means not solved,
+    # with `error` saying why). The final result also records peak RSS and stops tracemalloc if this run started it.
+    def _search_result(self, algorithm, started, move_sequence, nodes_expanded, nodes_generated, duplicates_skipped=0,
+                       peak_frontier=0, peak_visited=0, final=True, error=None):
+        start, tracing = started
+        result = SearchResult(algorithm, move_sequence, nodes_expanded, nodes_generated, duplicates_skipped,
+                              peak_frontier, peak_visited, time.perf_counter() - start)
+        result.error = error
+        tracemalloc = sys.modules.get("tracemalloc")  # Nothing can be tracing until it has been imported
+        if tracemalloc is not None and tracemalloc.is_tracing():
+            result.peak_traced_memory = tracemalloc.get_traced_memory()[1]
+        if final:
+            if tracing:
+                tracemalloc.stop()
+            result.peak_rss = peak_rss()
+        return result
+
+    # This helper method runs the parity check before a search. It returns an immediate "unsolvable" result,
+    # or None when the search should go ahead.
+    def _reject_unsolvable(self, algorithm, started):
+        if is_solvable(self.state, self.cols):
+            return None
+        result = self._search_result(algorithm, started, None, 0, 0, error="puzzle state is unsolvable")
+        result.unsolvable = True
+        return result
+
+    # This method solves the puzzle using Breath First Search Algorithm
+    @phase_timed
+    def solve_bfs(self, max_nodes=1000, track_memory=False, progress=None, progress_every=100000, engine="python"):
+        if engine == "numpy":
+            return self._solve_bfs_numpy(max_nodes, track_memory)
+        if engine != "python":
+            raise ValueError(f"Invalid engine: {engine}")
+        started = self._begin_search(track_memory)
+        unsolvable = self._reject_unsolvable("BFS", started)
+        if unsolvable is not None:
+            return unsolvable
+        geometry = self.geometry
+        neighbors, goal_code, bits = geometry.neighbors, geometry.goal_code, geometry.tile_bits
+
+        # Parent table doubles as the visited set: packed state -> (parent << 2) | move index
+        parents = {}
+        nodes_created = 0
+        nodes_generated = 1
+        duplicates_skipped = 0
+        peak_frontier = 1
+
+        # Queue stores (packed state, blank index, parent link) only; paths are rebuilt at the goal
+        queue = deque([(encode_state(self.state, bits), self.find_blank(), -1)])
+
+        # phase: start
+        while queue and nodes_created < max_nodes:
+            code, blank_index, link = queue.popleft()  # phase: frontier pop
+
+            if code in parents:
+                duplicates_skipped += 1
+                continue
+
+            parents[code] = link
+            nodes_created += 1  # phase: visited
+
+            if code == goal_code:
+                move_sequence = self._reconstruct_path(parents, code)
+                return self._search_result("BFS", started, move_sequence, nodes_created, nodes_generated,
+                                           duplicates_skipped, peak_frontier, len(parents))
+
+            # Generate successor states directly on the packed integer
+            for move_index, new_blank_index in neighbors[blank_index]:
+                new_code = swap_blank_code(code, blank_index, new_blank_index, bits)  # phase: successors
+                if new_code not in parents:  # phase test: visited
+                    queue.append((new_code, new_blank_index, (code << 2) | move_index))
+                    nodes_generated += 1  # phase: frontier push
+
+            if len(queue) > peak_frontier:
+                peak_frontier = len(queue)
+            if progress is not None and nodes_created % progress_every == 0:  # phase: bookkeeping
+                progress(self._search_result("BFS", started, None, nodes_created, nodes_generated,
+                                             duplicates_skipped, peak_frontier, len(parents), final=False))
+
+        return self._search_result("BFS", started, None, nodes_created, nodes_generated, duplicates_skipped,
+                                   peak_frontier, len(parents), error=f"maxnodes limit ({max_nodes}) reached")
+
+    # This helper method runs BFS a whole layer at a time on NumPy arrays of packed states. Every move changes the
+    # blank's square colour on a checkerboard, so a successor of layer k is either in layer k-1 or new, and only the
+    # previous layer needs a membership check. Each layer keeps the order in which the queue-based BFS first reaches
+    # its states, so node counts and solutions are identical to solve_bfs.
+    def _solve_bfs_numpy(self, max_nodes, track_memory=False):
+        started = self._begin_search(track_memory)
+        try:
+            import numpy as np
+        except ImportError:
+            return self._search_result("BFS", started, None, 0, 0,
+                                       error="engine=numpy requires NumPy (pip install numpy)")
+        geometry = self.geometry
+        bits = geometry.tile_bits
+        if bits * self.size > 64:
+            return self._search_result("BFS", started, None, 0, 0,
+                                       error="engine=numpy needs the packed state to fit in 64 bits (boards up to 4x4)")
+        unsolvable = self._reject_unsolvable("BFS", started)
+        if unsolvable is not None:
+            return unsolvable
+
+        # targets[move index, blank index] is the blank's index after the move, -1 where the move is impossible
+        targets = np.full((len(MOVES), self.size), -1, dtype=np.int64)
+        for blank_index, moves in enumerate(geometry.neighbors):
+            for move_index, new_blank_index in moves:
+                targets[move_index, blank_index] = new_blank_index
+        shift = np.uint64(bits)
+        mask = np.uint64(geometry.tile_mask)
+        goal_code = np.uint64(geometry.goal_code)
+
+        # Successors of the first `count` states of a layer that are not in `previous` (sorted), in the order the
+        # queue-based BFS pushes them: by parent, then by move index
+        def expand(codes, blanks, previous, count):
+            new_blanks = targets[:, blanks[:count]].T
+            rows, move_indices = np.nonzero(new_blanks >= 0)
+            new_blanks = new_blanks[rows, move_indices]
+            old_shift = blanks[rows].astype(np.uint64) * shift
+            new_shift = new_blanks.astype(np.uint64) * shift
+            parent_codes = codes[rows]
+            tiles = (parent_codes >> new_shift) & mask
+            children = parent_codes + (tiles << old_shift) - (tiles << new_shift)
+            if len(previous):
+                position = np.minimum(np.searchsorted(previous, children), len(previous) - 1)
+                fresh = previous[position] != children
+                children, new_blanks, rows, move_indices = (children[fresh], new_blanks[fresh], rows[fresh],
+                                                            move_indices[fresh])
+            return children, new_blanks, rows, move_indices
+
+        # The current layer: distinct states, their blanks, and where each state's first copy sits among the
+        # layer's queue entries (`copies` of them, duplicates included)
+        codes = np.array([encode_state(self.state, bits)], dtype=np.uint64)
+        blanks = np.array([self.find_blank()], dtype=np.int64)
+        first_copy = np.zeros(1, dtype=np.int64)
+        copies = 1
+        previous = np.empty(0, dtype=np.uint64)
+        links = []  # Per layer after the first: (parent's index in the layer before, move index) for every state
+        nodes_created = 0
+        nodes_generated = 1
+        duplicates_skipped = 0
+        peak_frontier = 1
+        solved = False
+
+        while max_nodes > nodes_created and len(codes):
+            width = len(codes)
+            goal_hits = np.flatnonzero(codes == goal_code)
+            goal = int(goal_hits[0]) if len(goal_hits) else None
+            if goal is not None and nodes_created + goal + 1 <= max_nodes:
+                solved, expanded, popped = True, goal, goal   # The goal is popped but not expanded
+            elif nodes_created + width >= max_nodes:
+                expanded = popped = max_nodes - nodes_created - 1   # Stop right after the max_nodes-th state
+            else:
+                expanded = popped = None
+
+            count = width if expanded is None else expanded + (0 if solved else 1)
+            children, child_blanks, rows, move_indices = expand(codes, blanks, previous, count)
+            nodes_generated += len(children)
+            if count:
+                # Queue length after expanding each state: this layer's entries still queued plus pushes so far
+                pushed = np.cumsum(np.bincount(rows, minlength=count))
+                peak_frontier = max(peak_frontier, int((copies - first_copy[:count] - 1 + pushed).max()))
+
+            if expanded is not None:
+                nodes_created += popped + 1
+                duplicates_skipped += int(first_copy[popped]) - popped
+                break
+            nodes_created += width
+            duplicates_skipped += copies - width
+
+            # Distinct successors in order of first appearance form the next layer
+            _, first = np.unique(children, return_index=True)
+            first.sort()
+            previous = np.sort(codes)
+            codes, blanks = children[first], child_blanks[first]
+            links.append((rows[first], move_indices[first]))
+            first_copy, copies = first, len(children)
+
+        if not solved:
+            return self._search_result("BFS", started, None, nodes_created, nodes_generated, duplicates_skipped,
+                                       peak_frontier, nodes_created, error=f"maxnodes limit ({max_nodes}) reached")
+
+        move_sequence = []
+        index = goal
+        for parent_indices, layer_moves in reversed(links):
+            move_sequence.append(MOVES[layer_moves[index]])
+            index = parent_indices[index]
+        move_sequence.reverse()
+        return self._search_result("BFS", started, move_sequence, nodes_created, nodes_generated, duplicates_skipped,
+                                   peak_frontier, nodes_created)
+
+    # This method solves the puzzle using Bidirectional Breadth First Search: whole layers are expanded alternately
+    # from the start and from the goal (always the smaller frontier) until the two searches meet
+    def solve_bibfs(self, max_nodes=1000, track_memory=False):
+        started = self._begin_search(track_memory)
+        unsolvable = self._reject_unsolvable("BiBFS", started)
+        if unsolvable is not None:
+            return unsolvable
+        geometry = self.geometry
+        neighbors, goal_code, bits = geometry.neighbors, geometry.goal_code, geometry.tile_bits
+        start_code = encode_state(self.state, bits)
+
+        # One parent table per direction. Backward links store the move that leads *toward* the goal.
+        forward = {start_code: -1}
+        backward = {goal_code: -1}
+        forward_frontier = [(start_code, self.find_blank())]
+        backward_frontier = [(goal_code, 0)]
+        nodes_created = 0
+        nodes_generated = 2
+        peak_frontier = 2
+        meeting = start_code if start_code == goal_code else None
+
+        while meeting is None and forward_frontier and backward_frontier and nodes_created < max_nodes:
+            is_forward = len(forward_frontier) <= len(backward_frontier)
+            if is_forward:
+                frontier, parents, others = forward_frontier, forward, backward
+            else:
+                frontier, parents, others = backward_frontier, backward, forward
+
+            next_frontier = []
+            for code, blank_index in frontier:
+                if nodes_created >= max_nodes:
+                    break
+                nodes_created += 1
+
+                for move_index, new_blank_index in neighbors[blank_index]:
+                    new_code = swap_blank_code(code, blank_index, new_blank_index, bits)
+                    if new_code in parents:
+                        continue
+                    parents[new_code] = (code << 2) | (move_index if is_forward else OPPOSITE_MOVES[move_index])
+                    next_frontier.append((new_code, new_blank_index))
+                    nodes_generated += 1
+
+                    # Both sides finished their previous layers without meeting, so the first meeting is optimal
+                    if new_code in others:
+                        meeting = new_code
+                        break
+                if meeting is not None:
+                    break
+
+            if is_forward:
+                forward_frontier = next_frontier
+            else:
+                backward_frontier = next_frontier
+            peak_frontier = max(peak_frontier, len(forward_frontier) + len(backward_frontier))
+
+        if meeting is None:
+            return self._search_result("BiBFS", started, None, nodes_created, nodes_generated,
+                                       peak_frontier=peak_frontier, peak_visited=len(forward) + len(backward),
+                                       error=f"maxnodes limit ({max_nodes}) reached")
+
+        # Join the start->meeting half with the meeting->goal half
+        move_sequence = self._reconstruct_path(forward, meeting)
+        link = backward[meeting]
+        while link >= 0:
+            move_sequence.append(MOVES[link & 3])
+            link = backward[link >> 2]
+
+        return self._search_result("BiBFS", started, move_sequence, max(nodes_created, 1), nodes_generated,
+                                   peak_frontier=peak_frontier, peak_visited=len(forward) + len(backward))
+
+    # This method solves the puzzle using Depth First Search Algorithm
+    @phase_timed
+    def solve_dfs(self, max_nodes=1000, depth_limit=31, track_memory=False, progress=None, progress_every=100000):
+        started = self._begin_search(track_memory)
+        unsolvable = self._reject_unsolvable("DFS", started)
+        if unsolvable is not None:
+            return unsolvable
+        geometry = self.geometry
+        neighbors, goal_code, bits = geometry.neighbors, geometry.goal_code, geometry.tile_bits
+
+        # Parent table doubles as the visited set: packed state -> (parent << 2) | move index
+        parents = {}
+        nodes_created = 0
+        nodes_generated = 1
+        duplicates_skipped = 0
+        peak_frontier = 1
+
+        # Stack stores (packed state, blank index, parent link, depth)
+        stack = [(encode_state(self.state, bits), self.find_blank(), -1, 0)]
+
+        # phase: start
+        while stack and nodes_created < max_nodes:
+            code, blank_index, link, depth = stack.pop()  # phase: frontier pop
+
+            # Skip visited states & avoid exceeding depth limit
+            if code in parents or depth > depth_limit:
+                duplicates_skipped += 1
+                continue
+
+            parents[code] = link
+            nodes_created += 1  # phase: visited
+
+            if code == goal_code:
+                move_sequence = self._reconstruct_path(parents, code)
+                return self._search_result("DFS", started, move_sequence, nodes_created, nodes_generated,
+                                           duplicates_skipped, peak_frontier, len(parents))
+
+            # Generate successor states directly on the packed integer
+            for move_index, new_blank_index in neighbors[blank_index]:
+                new_code = swap_blank_code(code, blank_index, new_blank_index, bits)  # phase: successors
+                if new_code not in parents:  # phase test: visited
+                    stack.append((new_code, new_blank_index, (code << 2) | move_index, depth + 1))
+                    nodes_generated += 1  # phase: frontier push
+
+            if len(stack) > peak_frontier:
+                peak_frontier = len(stack)
+            if progress is not None and nodes_created % progress_every == 0:  # phase: bookkeeping
+                progress(self._search_result("DFS", started, None, nodes_created, nodes_generated,
+                                             duplicates_skipped, peak_frontier, len(parents), final=False))
+
+        return self._search_result("DFS", started, None, nodes_created, nodes_generated, duplicates_skipped,
+                                   peak_frontier, len(parents),
+                                   error=f"maxnodes limit ({max_nodes}) reached or depth limit exceeded")
+
+    # This method uses the A* search to solve the puzzle
+    # With weight w > 1 this is Weighted A* (f = g + w*h): it expands far fewer nodes and its solutions are at most
+    # w times longer than optimal. queue="bucket" uses a BucketQueue instead of the binary heap (integer f only).
+    @phase_timed
+    def solve_astar(self, heuristic="h1", max_nodes=1000, track_memory=False, progress=None, progress_every=100000,
+                    weight=1, queue="heap"):
+        # h1 = number of misplaced tiles, h2 = sum of Manhattan distances, pdb = pattern databases
+        table, lookup = self._heuristic(heuristic)
+        if weight < 1:
+            raise ValueError(f"Invalid weight: {weight}")
+        if queue not in ("heap", "bucket") or (queue == "bucket" and weight != int(weight)):
+            raise ValueError(f"Invalid queue: {queue}")
+        algorithm = f"A*({heuristic})" if weight == 1 else f"WA*({heuristic},w={weight:g})"
+        started = self._begin_search(track_memory)
+        unsolvable = self._reject_unsolvable(algorithm, started)
+        if unsolvable is not None:
+            return unsolvable
+        geometry = self.geometry
+        neighbors, goal_code, bits = geometry.neighbors, geometry.goal_code, geometry.tile_bits
+        mask = geometry.tile_mask
+        weight = int(weight) if weight == int(weight) else weight  # Keep f an int whenever possible
+
+        # Parent table doubles as the closed set: packed state -> (parent << 2) | move index
+        parents = {}
+        # Best g pushed so far per state, so a child that is no better than a queued copy is not pushed again.
+        # Dropping such children, and never reopening closed states, is only optimal for a consistent heuristic;
+        # h1, h2 and pdb all are, so the first copy of a state taken off the open list has its best g.
+        best_g = {}
+        nodes_created = 0
+        nodes_generated = 1
+        duplicates_skipped = 0
+        peak_frontier = 1
+
+        # Open list ordered by lowest f, then highest g (deeper nodes are closer to the goal), then insertion order.
+        # Heap entries are (f, -g, insertion counter, packed state, blank index, heuristic key, parent link);
+        # bucket entries are the last four fields, filed under f and g.
+        initial_key = sum(table[tile][i] for i, tile in enumerate(self.state))
+        initial_h = initial_key if lookup is None else lookup(initial_key, self.find_blank())
+        start_code = encode_state(self.state, bits)
+        best_g[start_code] = 0
+        bucket = queue == "bucket"
+        if bucket:
+            pq = BucketQueue()
+            pq.push(weight * initial_h, 0, (start_code, self.find_blank(), initial_key, -1))
+        else:
+            pq = [(weight * initial_h, 0, 0, start_code, self.find_blank(), initial_key, -1)]
+
+        # phase: start
+        while pq and nodes_created < max_nodes:
+            if bucket:  # phase: frontier pop
+                priority, g, (code, blank_index, key, link) = pq.pop()
+            else:
+                priority, g, _, code, blank_index, key, link = heapq.heappop(pq)
+                g = -g
+
+            # A copy superseded by a cheaper path that was already expanded
+            if code in parents:
+                duplicates_skipped += 1
+                continue
+
+            parents[code] = link
+            nodes_created += 1  # phase: visited
+
+            if code == goal_code:
+                move_sequence = self._reconstruct_path(parents, code)
+                return self._search_result(algorithm, started, move_sequence, nodes_created, nodes_generated,
+                                           duplicates_skipped, peak_frontier, len(parents))
+
+            new_g = g + 1
+            for move_index, new_blank_index in neighbors[blank_index]:
+                # The moved tile slides from new_blank_index into blank_index; only its term of the key changes
+                tile = (code >> (bits * new_blank_index)) & mask
+                new_code = (code + (tile << (bits * blank_index))  # phase: successors
+                            - (tile << (bits * new_blank_index)))
+                if new_code in parents or best_g.get(new_code, new_g + 1) <= new_g:  # phase test: visited
+                    continue
+                best_g[new_code] = new_g
+                tile_key = table[tile]
+                new_key = key + tile_key[blank_index] - tile_key[new_blank_index]
+                new_priority = new_g + weight * (new_key if lookup is None else lookup(new_key, new_blank_index))
+                nodes_generated += 1  # phase: heuristic
+                if bucket:  # phase: frontier push
+                    pq.push(new_priority, new_g, (new_code, new_blank_index, new_key, (code << 2) | move_index))
+                else:
+                    heapq.heappush(pq, (new_priority, -new_g, nodes_generated, new_code, new_blank_index, new_key,
+                                        (code << 2) | move_index))
+
+            if len(pq) > peak_frontier:
+                peak_frontier = len(pq)
+            if progress is not None and nodes_created % progress_every == 0:  # phase: bookkeeping
+                progress(self._search_result(algorithm, started, None, nodes_created, nodes_generated,
+                                             duplicates_skipped, peak_frontier, len(parents), final=False))
+
+        return self._search_result(algorithm, started, None, nodes_created, nodes_generated, duplicates_skipped,
+                                   peak_frontier, len(parents), error=f"maxnodes limit ({max_nodes}) reached")
+
+    # This method runs Anytime Repairing A* (ARA*): a weighted A* pass finds a first solution quickly, then the weight
+    # is lowered step by step and each pass reuses the previous search to improve the solution, until the weight
+    # reaches 1 (optimal) or the node or time budget runs out. The best solution found so far is returned.
+    def solve_arastar(self, heuristic="h1", weight=3.0, step=0.5, max_nodes=1000, time_limit=None,
+                      track_memory=False):
+        table, lookup = self._heuristic(heuristic)
+        if weight < 1 or step <= 0:
+            raise ValueError(f"Invalid weight schedule: weight={weight}, step={step}")
+        algorithm = f"ARA*({heuristic})"
+        started = self._begin_search(track_memory)
+        unsolvable = self._reject_unsolvable(algorithm, started)
+        if unsolvable is not None:
+            return unsolvable
+        geometry = self.geometry
+        neighbors, goal_code, bits = geometry.neighbors, geometry.goal_code, geometry.tile_bits
+        mask = geometry.tile_mask
+        deadline = None if time_limit is None else started[0] + time_limit
+
+        # Per packed state: best g, parent link, and (blank index, heuristic key, h) for re-expanding it later
+        start_code = encode_state(self.state, bits)
+        start_key = sum(table[tile][i] for i, tile in enumerate(self.state))
+        best_g = {start_code: 0}
+        parents = {start_code: -1}
+        info = {start_code: (self.find_blank(), start_key, start_key if lookup is None else lookup(start_key, self.find_blank()))}
+
+        # Open entries are (priority, g, packed state); an entry is stale once its state has a smaller g or is closed
+        pq = [(weight * info[start_code][2], 0, start_code)]
+        closed = set()
+        inconsistent = set()  # Closed states whose g improved during the current pass
+        nodes_created = 0
+        nodes_generated = 1
+        duplicates_skipped = 0
+        peak_frontier = 1
+        best_moves = None
+        improvements = []  # (weight, solution length, nodes) each time a pass finds a shorter solution
+        bound = None
+        proven_weight = math.inf  # Weight of the last pass that ran to completion
+
+        while True:
+            # One weighted A* pass; it ends once no open state could lead to a better solution
+            while pq and nodes_created < max_nodes and (deadline is None or time.perf_counter() < deadline):
+                if goal_code in best_g and best_g[goal_code] <= pq[0][0]:
+                    break
+                priority, g, code = heapq.heappop(pq)
+                if code in closed or g != best_g[code]:
+                    duplicates_skipped += 1
+                    continue
+                closed.add(code)
+                nodes_created += 1
+                blank_index, key, _ = info[code]
+
+                for move_index, new_blank_index in neighbors[blank_index]:
+                    tile = (code >> (bits * new_blank_index)) & mask
+                    new_code = code + (tile << (bits * blank_index)) - (tile << (bits * new_blank_index))
+                    new_g = g + 1
+                    if new_g >= best_g.get(new_code, new_g + 1):
+                        continue
+                    best_g[new_code] = new_g
+                    parents[new_code] = (code << 2) | move_index
+                    if new_code not in info:
+                        tile_key = table[tile]
+                        new_key = key + tile_key[blank_index] - tile_key[new_blank_index]
+                        info[new_code] = (new_blank_index, new_key, new_key if lookup is None else lookup(new_key, new_blank_index))
+                    if new_code in closed:
+                        inconsistent.add(new_code)
+                    else:
+                        heapq.heappush(pq, (new_g + weight * info[new_code][2], new_g, new_code))
+                        nodes_generated += 1
+
+                if len(pq) > peak_frontier:
+                    peak_frontier = len(pq)
+
+            pass_complete = not pq or (goal_code in best_g and best_g[goal_code] <= pq[0][0])
+            if pass_complete:
+                proven_weight = weight
+            out_of_budget = nodes_created >= max_nodes or (deadline is not None and time.perf_counter() >= deadline)
+            if goal_code in best_g and (best_moves is None or best_g[goal_code] < len(best_moves)):
+                best_moves = self._reconstruct_path(parents, goal_code)
+                improvements.append((weight, len(best_moves), nodes_created))
+
+            # Suboptimality bound: the solution is within this factor of optimal. Every inconsistent state on an
+            # optimal path is open or in INCONS with an optimal g, so the smallest g + h among them is a lower bound.
+            # Like closing states without reopening them, this relies on the heuristic being consistent (h1, h2 and
+            # pdb all are); an inconsistent one could close a state with a too-large g and make the bound a lie.
+            if best_moves is not None:
+                open_states = {code for _, g, code in pq if code not in closed and g == best_g[code]} | inconsistent
+                lowest_f = min((best_g[code] + info[code][2] for code in open_states), default=len(best_moves))
+                bound = min(proven_weight, len(best_moves) / lowest_f if lowest_f else 1.0)
+            if out_of_budget or not pass_complete or weight <= 1 or (bound is not None and bound <= 1):
+                break
+
+            # Lower the weight and start the next pass from every open and inconsistent state, re-prioritized
+            weight = max(1.0, weight - step)
+            open_states = {code for _, g, code in pq if code not in closed and g == best_g[code]} | inconsistent
+            pq = [(best_g[code] + weight * info[code][2], best_g[code], code) for code in open_states]
+            heapq.heapify(pq)
+            closed = set()
+            inconsistent = set()
+
+        if best_moves is None:
+            if nodes_created >= max_nodes:
+                error = f"maxnodes limit ({max_nodes}) reached"
+            else:
+                error = f"time limit ({time_limit}s) reached"
+            return self._search_result(algorithm, started, None, nodes_created, nodes_generated, duplicates_skipped,
+                                       peak_frontier, len(best_g), error=error)
+
+        result = self._search_result(algorithm, started, best_moves, nodes_created, nodes_generated,
+                                     duplicates_skipped, peak_frontier, len(best_g))
+        result.improvements = improvements
+        result.suboptimality_bound = bound
+        return result
+
+    # This method solves the puzzle using Iterative Deepening A* (memory grows only with solution depth)
+    def solve_idastar(self, heuristic="h1", max_nodes=1000, track_memory=False):
+        table, lookup = self._heuristic(heuristic)
+        algorithm = f"IDA*({heuristic})"
+        started = self._begin_search(track_memory)
+        unsolvable = self._reject_unsolvable(algorithm, started)
+        if unsolvable is not None:
+            return unsolvable
+        neighbors, goal_state = self.geometry.neighbors, self.geometry.goal_state
+
+        # A single board is modified in place (move/undo) and the path holds move indices
+        board = self.state.copy()
+        path = []
+        nodes_created = 0
+        found = -1    # search() result when the goal is reached
+        aborted = -2  # search() result when the maxnodes budget runs out
+
+        def search(blank_index, g, key, bound, banned_move):
+            nonlocal nodes_created
+            if nodes_created >= max_nodes:
+                return aborted
+            nodes_created += 1
+
+            h = key if lookup is None else lookup(key, blank_index)
+            f = g + h
+            if f > bound:
+                return f
+            if h == 0 and board == goal_state:
+                return found
+
+            next_bound = math.inf
+            for move_index, new_blank_index in neighbors[blank_index]:
+                # Never undo the move that led here
+                if move_index == banned_move:
+                    continue
+
+                tile = board[new_blank_index]
+                board[blank_index], board[new_blank_index] = tile, 0
+                path.append(move_index)
+
+                tile_key = table[tile]
+                result = search(new_blank_index, g + 1, key + tile_key[blank_index] - tile_key[new_blank_index],
+                                bound, OPPOSITE_MOVES[move_index])
+                if result == found:
+                    return found
+
+                path.pop()
+                board[blank_index], board[new_blank_index] = 0, tile
+
+                if result == aborted:
+                    return aborted
+                next_bound = min(next_bound, result)
+            return next_bound
+
+        initial_key = sum(table[tile][i] for i, tile in enumerate(board))
+        bound = initial_key if lookup is None else lookup(initial_key, board.index(0))
+
+        # Deepen the f-cost bound to the smallest f that exceeded it in the previous iteration
+        while True:
+            result = search(board.index(0), 0, initial_key, bound, -1)
+            if result == found:
+                move_sequence = [MOVES[move_index] for move_index in path]
+                # The recursion stack is the only frontier, so its peak is the solution depth
+                return self._search_result(algorithm, started, move_sequence, nodes_created, nodes_created,
+                                           peak_frontier=len(path))
+            if result == aborted or result == math.inf:
+                break
+            bound = result
+
+        return self._search_result(algorithm, started, None, nodes_created, nodes_created,
+                                   error=f"maxnodes limit ({max_nodes}) reached")
+
+    # This method solves the puzzle from the distance oracle by stepping to a neighbour one move closer each time
+    def solve_oracle(self):
+        started = self._begin_search()
+        if not self.geometry.is_eight_puzzle:
+            return self._search_result("ORACLE", started, None, 0, 0,
+                                       error="the distance oracle is only available for the 3x3 puzzle")
+
+        unsolvable = self._reject_unsolvable("ORACLE", started)
+        if unsolvable is not None:
+            return unsolvable
+
+        oracle = load_distance_oracle()
+        board = self.state.copy()
+        blank_index = board.index(0)
+        distance = oracle[rank_state(board)]
+        nodes_created = 1
+
+        if distance == ORACLE_UNREACHABLE:
+            return self._search_result("ORACLE", started, None, nodes_created, nodes_created,
+                                       error="puzzle state is unsolvable")
+
+        move_sequence = []
+        while distance > 0:
+            for move_index, new_blank_index in NEIGHBORS[blank_index]:
+                board[blank_index], board[new_blank_index] = board[new_blank_index], 0
+                nodes_created += 1
+                if oracle[rank_state(board)] == distance - 1:
+                    move_sequence.append(MOVES[move_index])
+                    blank_index = new_blank_index
+                    distance -= 1
+                    break
+                board[blank_index], board[new_blank_index] = 0, board[blank_index]
+
+        return self._search_result("ORACLE", started, move_sequence, nodes_created, nodes_created)
+
+    # This method builds (or rebuilds) the distance oracle file and reports its coverage
+    def build_oracle(self):
+        if not self.geometry.is_eight_puzzle:
+            print("Error: the distance oracle is only available for the 3x3 puzzle")
+            return False
+        oracle = bytes(load_distance_oracle(rebuild=True))
+        reachable = ORACLE_SIZE - oracle.count(ORACLE_UNREACHABLE)
+        max_depth = max(d for d in set(oracle) if d != ORACLE_UNREACHABLE)
+        print(f"Oracle built: {reachable} reachable states, maximum depth {max_depth}")
+        return True
+
+    # This helper method returns the cache key for the current state under a solver name. With symmetry folding on,
+    # square boards use the smaller packed code of the board and its transpose, so both orientations share one entry;
+    # the second value tells whether the entry is stored transposed.
+    def _solution_key(self, algorithm):
+        bits = self.geometry.tile_bits
+        code = encode_state(self.state, bits)
+        transposed = False
+        if self.solution_cache.symmetry and self.rows == self.cols:
+            transposed_code = encode_state(transpose_state(self.state, self.rows), bits)
+            if transposed_code < code:
+                code, transposed = transposed_code, True
+        return f"{self.rows}x{self.cols}:{algorithm}:{code}", transposed
+
+    # This method answers a solve from the solution cache, or runs solve() and caches the solution it finds.
+    # A hit for the orientation that was searched returns the stored solution and node counts just like the solver
+    # would. A hit through the transpose (symmetry folding only) returns a solution of the same length, but not
+    # necessarily the path the solver would pick (move order is not symmetric under transposition), and no node counts.
+    def cached_solve(self, algorithm, max_nodes, solve):
+        cache = self.solution_cache
+        key, transposed = self._solution_key(algorithm)
+        started = self._begin_search()
+        entry = cache.get(key, max_nodes, transposed)
+        if entry is not None:
+            moves, nodes_expanded, nodes_generated, searched_transposed = entry
+            move_sequence = [MOVES[TRANSPOSED_MOVES[int(m)] if transposed else int(m)] for m in moves]
+            if searched_transposed != transposed:
+                nodes_expanded = nodes_generated = None
+            return self._search_result(algorithm, started, move_sequence, nodes_expanded, nodes_generated)
+
+        result = solve()
+        if result:
+            moves = ''.join(str(TRANSPOSED_MOVES[i] if transposed else i)
+                            for i in (MOVES.index(move) for move in result.move_sequence))
+            cache.put(key, (moves, result.nodes_expanded, result.nodes_generated, transposed))
+        return result
+
+    # This method prints the solution cache counters
+    def cache_stats(self):
+        cache = self.solution_cache
+        print(f"Cached solutions: {len(cache.entries)}/{cache.capacity}")
+        print(f"Hits: {cache.hits}, Misses: {cache.misses}, Hit rate: {cache.hit_rate:.1%}")
+        print(f"File: {cache.path if cache.path else 'none'}")
+        return True
+
+    # This method runs a command under a profiler. mode="cprofile" prints the top `limit` functions sorted by `sort`
+    # (stats from solver worker processes, e.g. compareSearch's, are merged in) and saves the raw stats to `out`;
+    # mode="sample" writes a collapsed-stack flamegraph file; mode="phases" prints per-phase solver loop times.
+    def profile_command(self, command, mode="cprofile", out=None, sort="cumulative", limit=25, interval=0.001):
+        global _child_profile_dir
+        import cProfile
+        import pstats
+        import shutil
+        import tempfile
+
+        if mode == "cprofile":
+            if sort not in pstats.Stats.sort_arg_dict_default:
+                raise ValueError(f"Invalid sort key: {sort}")
+            profiler = cProfile.Profile()
+            _child_profile_dir = tempfile.mkdtemp(prefix="8puzzle-profile-")
+            try:
+                profiler.enable()
+                try:
+                    outcome = self.cmd(command)
+                finally:
+                    profiler.disable()
+                stats = pstats.Stats(profiler, stream=sys.stdout)
+                for name in sorted(os.listdir(_child_profile_dir)):
+                    stats.add(os.path.join(_child_profile_dir, name))
+                stats.files = []  # Skip the header listing every temporary stats file
+            finally:
+                shutil.rmtree(_child_profile_dir, ignore_errors=True)
+                _child_profile_dir = None
+            stats.sort_stats(sort).print_stats(limit)
+            if out is not None:
+                stats.dump_stats(out)
+                print(f"Profile written to {out}")
+        elif mode == "sample":
+            sampler = StackSampler(interval)
+            sampler.start()
+            try:
+                outcome = self.cmd(command)
+            finally:
+                sampler.stop()
+            out = out or "profile.folded"
+            sampler.write_collapsed(out)
+            print(f"{sum(sampler.samples.values())} samples written to {out} (collapsed stacks for flamegraph.pl)")
+        elif mode == "phases":
+            self.phase_timer = PhaseTimer()
+            try:
+                outcome = self.cmd(command)
+            finally:
+                timer, self.phase_timer = self.phase_timer, None
+            print(format_table(timer.report(), headers=["Phase", "Time (s)", "Laps", "Share", "ns/lap"]))
+        else:
+            raise ValueError(f"Invalid profile mode: {mode}")
+        return outcome
+
+    # This method runs one of the solvers by its command name (BFS, BiBFS, DFS, A*, WA*, ARA*, IDA*, ORACLE)
+    def run_solver(self, algo, heuristic="h1", max_nodes=1000, depth_limit=31, track_memory=False):
+        if algo == 'BFS':
+            return self.solve_bfs(max_nodes, track_memory=track_memory)
+        elif algo == 'BiBFS':
+            return self.solve_bibfs(max_nodes, track_memory=track_memory)
+        elif algo == 'DFS':
+            return self.solve_dfs(max_nodes, depth_limit, track_memory=track_memory)
+        elif algo == 'A*':
+            return self.solve_astar(heuristic, max_nodes, track_memory=track_memory)
+        elif algo == 'WA*':
+            return self.solve_astar(heuristic, max_nodes, track_memory=track_memory, weight=WA_STAR_WEIGHT)
+        elif algo == 'ARA*':
+            return self.solve_arastar(heuristic, max_nodes=max_nodes, track_memory=track_memory)
+        elif algo == 'IDA*':
+            return self.solve_idastar(heuristic, max_nodes, track_memory=track_memory)
+        elif algo == 'ORACLE':
+            return self.solve_oracle()
+        raise ValueError(f"Invalid algorithm: {algo}")
+
+    # This helper method yields start states for solveBatch from an open file: one state per line, either 9 tiles or
+    # a setState command. Other commands (e.g. the solve lines of an ordinary command file) and comments are skipped.
+    def _read_batch_states(self, file):
+        for line_number, line in enumerate(file, 1):
+            parts = line.split()
+            if parts and parts[0] == 'setState':
+                parts = parts[1:]
+            elif not parts or not parts[0].isdigit():
+                continue
+            try:
+                state = [int(x) for x in parts]
+            except ValueError:
+                state = []
+            if len(state) != self.size or sorted(state) != self.geometry.goal_state:
+                print(f"Error: invalid puzzle state on line {line_number}")
+                continue
+            yield state
+
+    # This method solves every start state in a file in parallel worker processes, streaming one result line per
+    # state either in input order or as chunks finish (order="completion"). The file is read as chunks are submitted,
+    # with at most BATCH_CHUNKS_PER_WORKER chunks per worker in flight, so memory stays bounded on large inputs.
+    def solve_batch(self, filename, algo="A*", heuristic="h2", max_nodes=100000, workers=None, order="input",
+                    chunk_size=None):
+        from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+        if order not in ("input", "completion"):
+            raise ValueError(f"Invalid order: {order}")
+        if algo in ('A*', 'WA*', 'ARA*', 'IDA*'):
+            self._heuristic(heuristic)  # Validate, and load any table once before the workers fork
+        elif algo == 'ORACLE':
+            if not self.geometry.is_eight_puzzle:
+                raise ValueError("The distance oracle is only available for the 3x3 puzzle")
+            load_distance_oracle()
+        elif algo not in ('BFS', 'BiBFS', 'DFS'):
+            raise ValueError(f"Invalid algorithm: {algo}")
+
+        try:
+            file = open(filename, 'r')
+        except FileNotFoundError:
+            print(f"Error: File {filename} not found")
+            return False
+
+        workers = workers or os.cpu_count() or 1
+        max_in_flight = workers * BATCH_CHUNKS_PER_WORKER
+        jobs = enumerate(self._read_batch_states(file), 1)
+        if chunk_size is None:
+            # Small states solve quickly, so jobs are sent in chunks to keep inter-process overhead low. A short
+            # input is split into enough chunks to keep every worker busy; a long one uses full-size chunks.
+            head = list(itertools.islice(jobs, max_in_flight * BATCH_CHUNK_SIZE))
+            chunk_size = max(1, min(BATCH_CHUNK_SIZE, -(-len(head) // max_in_flight)))
+            jobs = itertools.chain(head, jobs)
+        chunks = iter(lambda: list(itertools.islice(jobs, chunk_size)), [])
+        total = 0
+        solved = 0
+
+        with file, ProcessPoolExecutor(max_workers=workers) as executor:
+            def submit_next():
+                chunk = next(chunks, None)
+                if chunk is not None:
+                    futures.append(executor.submit(_solve_batch_chunk, chunk, (self.rows, self.cols), algo, heuristic,
+                                                   max_nodes))
+
+            futures = deque()
+            for _ in range(max_in_flight):
+                submit_next()
+
+            while futures:
+                if order == "input":
+                    finished = [futures.popleft()]
+                else:
+                    finished, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    futures = deque(future for future in futures if future not in finished)
+                for future in finished:
+                    for index, state, result in future.result():
+                        total += 1
+                        tiles = ' '.join(map(str, state))
+                        if result:
+                            move_sequence, nodes_created = result
+                            solved += 1
+                            print(f"[{index}] {tiles}: Solution length: {len(move_sequence)}, "
+                                  f"Nodes created: {nodes_created}, Moves: {' '.join(move_sequence)}")
+                        elif result.unsolvable:
+                            print(f"[{index}] {tiles}: unsolvable")
+                        else:
+                            print(f"[{index}] {tiles}: no solution found")
+                    submit_next()
+
+        print(f"Solved {solved} of {total} states")
+        return True
+
+    # This method calculates the Effective Branching Factor using an iterative approach using binary search method (considered Newton's method before)
+    def effective_branching_factor(self, N, d, tolerance=1e-6):
+    
+        if d == 0:
+            return 0  # No branching if depth is zero
+
+        low, high = 1, N  # b* is at least 1 and at most N
+        
+        while high - low > tolerance:
+            mid = (low + high) / 2
+            try:
+                # Compute sum of geometric series (bounded to avoid overflow)
+                computed_N = sum(mid ** i for i in range(d + 1))
+                if computed_N < N + 1:
+                    low = mid
+                else:
+                    high = mid
+            except OverflowError:
+                high = mid  # If overflow occurs, reduce the upper bound
+
+        return round(mid, 6)  # Return rounded result for readability
+    
+    # This helper method lists the compared algorithms as name -> (algo, heuristic, max nodes, depth limit)
+    def _comparison_specs(self, bfs_maxnodes, dfs_depth_limit, dfs_maxnodes, astar_h1_maxnodes, astar_h2_maxnodes,
+                          astar_pdb_maxnodes):
+        specs = {
+            "BFS": ('BFS', 'h1', bfs_maxnodes, 31),
+            "DFS": ('DFS', 'h1', dfs_maxnodes, dfs_depth_limit),
+            "A*(h1)": ('A*', 'h1', astar_h1_maxnodes, 31),
+            "A*(h2)": ('A*', 'h2', astar_h2_maxnodes, 31),
+        }
+        if self.geometry.is_eight_puzzle:
+            specs["A*(pdb)"] = ('A*', 'pdb', astar_pdb_maxnodes, 31)
+        return specs
+
+    # This method creates a table to compare the effective branching factor of BFS, DFS, and A-star search with h1, h2 and pdb.
+    # Each algorithm runs concurrently in its own process; one that exceeds timeout (seconds) is stopped and counted as failed.
+    def compare_search_algorithms(self, bfs_maxnodes, dfs_depth_limit, dfs_maxnodes, astar_h1_maxnodes, astar_h2_maxnodes,
+                                  astar_pdb_maxnodes=10000, timeout=None, track_memory=False):
+        
+        search_algorithms = self._comparison_specs(bfs_maxnodes, dfs_depth_limit, dfs_maxnodes, astar_h1_maxnodes,
+                                                   astar_h2_maxnodes, astar_pdb_maxnodes)
+        if self.geometry.is_eight_puzzle:
+            load_pattern_database()  # Load once here so the worker processes inherit it
+
+        jobs = [((self.rows, self.cols), self.state.copy(), algo, heuristic, max_nodes, depth_limit, True, track_memory)
+                for algo, heuristic, max_nodes, depth_limit in search_algorithms.values()]
+        outcomes = run_solver_jobs(jobs, timeout=timeout, workers=len(jobs))
+
+        results = []
+        for name, outcome in zip(search_algorithms, outcomes):
+            if outcome is None:
+                print(f"Error: {name} timed out after {timeout} seconds")
+                result = None
+            else:
+                result, _, output = outcome
+                print(output, end='')  # Solver output, in the usual algorithm order
+        
+            if not result:
+                move_sequence, nodes_created = [], 0  # Default values for failed searches
+            else:
+                move_sequence, nodes_created = result  # Extract move sequence and nodes generated
+            d = len(move_sequence) if move_sequence else 0
+            b_star = self.effective_branching_factor(nodes_created, d)
+            results.append((name, nodes_created, d, b_star, move_sequence, result))
+        
+        return results
+
+    # This method compares the algorithms over many seeded scrambles, running all (instance, algorithm) pairs on a
+    # pool of worker processes, and reports per-algorithm statistics over the solved instances
+    def compare_search_instances(self, instances, scramble_moves, seed, bfs_maxnodes, dfs_depth_limit, dfs_maxnodes,
+                                 astar_h1_maxnodes, astar_h2_maxnodes, astar_pdb_maxnodes=10000, timeout=None,
+                                 workers=None):
+        search_algorithms = self._comparison_specs(bfs_maxnodes, dfs_depth_limit, dfs_maxnodes, astar_h1_maxnodes,
+                                                   astar_h2_maxnodes, astar_pdb_maxnodes)
+        if self.geometry.is_eight_puzzle:
+            load_pattern_database()
+
+        generator = SlidingPuzzle(self.rows, self.cols)
+        generator.set_seed(seed)
+        states = []
+        for _ in range(instances):
+            generator.scramble_state(scramble_moves)
+            states.append(generator.state.copy())
+
+        jobs = [((self.rows, self.cols), state, algo, heuristic, max_nodes, depth_limit, False)
+                for state in states
+                for algo, heuristic, max_nodes, depth_limit in search_algorithms.values()]
+        outcomes = run_solver_jobs(jobs, timeout=timeout, workers=workers)
+
+        # Group outcomes by algorithm; jobs were laid out instance by instance
+        stats = {}
+        for position, name in enumerate(search_algorithms):
+            solved = []
+            timeouts = 0
+            for outcome in outcomes[position::len(search_algorithms)]:
+                if outcome is None:
+                    timeouts += 1
+                elif outcome[0]:
+                    (move_sequence, nodes_created), elapsed, _ = outcome
+                    d = len(move_sequence)
+                    solved.append((nodes_created, d, self.effective_branching_factor(nodes_created, d), elapsed))
+            stats[name] = (solved, timeouts)
+
+        self.display_instance_statistics(stats, instances)
+        return stats
+
+    # This method prints mean and percentile statistics from compare_search_instances, one column per algorithm
+    def display_instance_statistics(self, stats, instances):
+        names = list(stats)
+        table = [["Solved"] + [f"{len(stats[name][0])}/{instances}" for name in names],
+                 ["Timeouts"] + [stats[name][1] for name in names]]
+
+        for label, column in (("Nodes", 0), ("d", 1), ("b*", 2), ("Time (s)", 3)):
+            for statistic in ("mean", "p50", "p90", "p99"):
+                row = [f"{label} {statistic}"]
+                for name in names:
+                    values = [entry[column] for entry in stats[name][0]]
+                    if not values:
+                        row.append("-")
+                    elif statistic == "mean":
+                        row.append(round(sum(values) / len(values), 6))
+                    else:
+                        row.append(round(percentile(values, int(statistic[1:])), 6))
+                table.append(row)
+
+        print(format_table(table, headers=["Metric"] + names))
+    
+
+    # This method builds the benchmark instance sets: for every depth band, `per_band` seeded scrambles whose optimal
+    # depth (looked up in the distance oracle) falls in the band, plus the depth-31 states. Returns band -> instances.
+    def benchmark_instances(self, per_band, seed):
+        oracle = load_distance_oracle()
+        generator = EightPuzzle()
+        generator.set_seed(seed)
+        sets = {f"{low}-{high}": [] for low, high in BENCHMARK_DEPTH_BANDS}
+
+        # Scramble lengths vary so both shallow and deep bands fill up; deep states are rarer, so allow many tries
+        for _ in range(per_band * len(BENCHMARK_DEPTH_BANDS) * 200):
+            if all(len(instances) >= per_band for instances in sets.values()):
+                break
+            generator.scramble_state(generator.rng.randint(1, 200))
+            depth = oracle[rank_state(generator.state)]
+            for (low, high), instances in zip(BENCHMARK_DEPTH_BANDS, sets.values()):
+                if low <= depth <= high and len(instances) < per_band:
+                    instances.append({"state": generator.state.copy(), "depth": depth})
+
+        sets["31"] = [{"state": list(state), "depth": 31} for state in HARDEST_STATES]
+        return sets
+
+    # This method runs every benchmark solver over the instance sets (one process per run, so memory is measured
+    # per run), writes the statistics to a JSON report and, when a baseline report is given, compares against it.
+    # Each instance is solved `repeat` times and the fastest run is kept, which filters out scheduling noise.
+    def run_benchmark(self, out_file="benchmark.json", baseline_file=None, per_band=5, seed=0, solvers=None,
+                      timeout=60.0, workers=1, threshold=10.0, track_memory=False, repeat=3):
+        import datetime
+        import json
+        import platform
+
+        if not self.geometry.is_eight_puzzle:
+            print("Error: the benchmark instance sets are defined for the 3x3 puzzle")
+            return False
+        names = list(BENCHMARK_SOLVERS) if solvers is None else solvers
+        for name in names:
+            if name not in BENCHMARK_SOLVERS:
+                raise ValueError(f"Invalid solver: {name}")
+        baseline = None
+        if baseline_file is not None:
+            try:
+                with open(baseline_file, 'r') as file:
+                    baseline = json.load(file)
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"Error: cannot read baseline {baseline_file}: {e}")
+                return False
+
+        load_pattern_database()
+        sets = self.benchmark_instances(per_band, seed)
+        jobs = [((3, 3), instance["state"], BENCHMARK_SOLVERS[name][0], BENCHMARK_SOLVERS[name][1],
+                 BENCHMARK_SOLVERS[name][2], 31, False, track_memory)
+                for name in names for instances in sets.values() for instance in instances for _ in range(repeat)]
+        outcomes = iter(run_solver_jobs(jobs, timeout=timeout, workers=workers))
+
+        # Jobs were laid out solver by solver, band by band, instance by instance
+        results = {}
+        for name in names:
+            results[name] = {}
+            for band, instances in sets.items():
+                runs = []
+                for _ in instances:
+                    finished = [outcome for outcome in (next(outcomes) for _ in range(repeat)) if outcome is not None]
+                    runs.append(min(finished, key=lambda outcome: outcome[0].wall_time) if finished else None)
+                results[name][band] = benchmark_statistics(runs)
+
+        report = {
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "seed": seed,
+            "per_band": per_band,
+            "timeout": timeout,
+            "repeat": repeat,
+            "solvers": {name: list(BENCHMARK_SOLVERS[name]) for name in names},
+            "instances": sets,
+            "results": results,
+        }
+        try:
+            with open(out_file, 'w') as file:
+                json.dump(report, file, indent=2)
+        except OSError as e:
+            print(f"Error: cannot write {out_file}: {e}")
+            return False
+
+        self.display_benchmark(results)
+        print(f"Benchmark report written to {out_file}")
+        if baseline is not None:
+            if baseline.get("instances") != sets:
+                print("Warning: the baseline was run on different instances; comparisons may not be meaningful")
+            self.display_benchmark_comparison(results, baseline.get("results", {}), threshold)
+        return True
+
+    # This method prints the benchmark statistics, one row per solver and depth band
+    def display_benchmark(self, results):
+        table = []
+        for name, bands in results.items():
+            for band, stats in bands.items():
+                table.append([name, band, f"{stats['solved']}/{stats['instances']}", stats['timeouts'],
+                              stats['nodes_mean'], stats['nodes_per_second'], stats['latency_p50'],
+                              stats['latency_p90'], stats['latency_p99'], stats['peak_rss_mb']])
+        print(format_table(table, headers=["Solver", "Depth", "Solved", "Timeouts", "Nodes mean", "Nodes/s",
+                                           "p50 (s)", "p90 (s)", "p99 (s)", "Peak RSS (MB)"]))
+
+    # This method compares benchmark statistics with a baseline report's. A row is flagged as a regression when it
+    # solves fewer instances, or its nodes/s or p50 latency is worse by more than threshold percent.
+    def display_benchmark_comparison(self, results, baseline, threshold):
+        def change(new, old):
+            if new is None or old is None or old == 0:
+                return None
+            return round((new - old) / old * 100, 1)
+
+        table = []
+        regressions = 0
+        for name, bands in results.items():
+            for band, stats in bands.items():
+                old = baseline.get(name, {}).get(band)
+                if old is None:
+                    continue
+                speed = change(stats['nodes_per_second'], old.get('nodes_per_second'))
+                latency = change(stats['latency_p50'], old.get('latency_p50'))
+                nodes = change(stats['nodes_mean'], old.get('nodes_mean'))
+                regressed = (stats['solved'] < old.get('solved', 0) or (speed is not None and speed < -threshold)
+                             or (latency is not None and latency > threshold))
+                regressions += regressed
+                table.append([name, band, f"{old.get('solved')} -> {stats['solved']}", nodes, speed, latency,
+                              "REGRESSION" if regressed else ""])
+
+        if not table:
+            print("No solver and depth band in common with the baseline")
+            return
+        print(format_table(table, headers=["Solver", "Depth", "Solved", "Nodes mean %", "Nodes/s %", "p50 latency %",
+                                           ""]))
+        print(f"{regressions} regression(s) beyond {threshold:g}%")
+
+    # Displaying
+    def display_comparison_table(self, results):
+        # Initialize data structures, one column per algorithm in the order they were run
+        algorithms = list(dict.fromkeys(result[0] for result in results))
+        move_lengths = {algo: [] for algo in algorithms}
+        nodes_created = {algo: [] for algo in algorithms}
+        b_star_values = {algo: [] for algo in algorithms}
+
+        searches = {algo: [] for algo in algorithms}
+
+        # Populate data
+        for result in results:
+            algo, nodes, move_sequence_length, b_star, _, search = result  # move_sequence_length = len(move_sequence)
+            move_lengths[algo].append(move_sequence_length)
+            nodes_created[algo].append(nodes)
+            b_star_values[algo].append(b_star)
+            searches[algo].append(search)
+
+        # Create table as a list of rows
+        table = [
+            ["d"] + [move_lengths[algo] for algo in algorithms],
+            ["Nodes Created"] + [nodes_created[algo] for algo in algorithms],
+            ["b*"] + [b_star_values[algo] for algo in algorithms],
+        ]
+
+        # Instrumentation rows from each SearchResult ("-" when an algorithm timed out or a value was not measured)
+        megabytes = lambda value: round(value / 2 ** 20, 2) if value is not None else "-"
+        instrumentation = [
+            ("Nodes Generated", lambda search: search.nodes_generated),
+            ("Duplicates Skipped", lambda search: search.duplicates_skipped),
+            ("Peak Frontier", lambda search: search.peak_frontier),
+            ("Peak Visited", lambda search: search.peak_visited),
+            ("Time (s)", lambda search: round(search.wall_time, 6)),
+            ("Nodes/s", lambda search: round(search.nodes_per_second)),
+            ("Peak Traced (MB)", lambda search: megabytes(search.peak_traced_memory)),
+            ("Peak RSS (MB)", lambda search: megabytes(search.peak_rss)),
+        ]
+        for label, metric in instrumentation:
+            table.append([label] + [[metric(search) if search is not None else "-" for search in searches[algo]]
+                                    for algo in algorithms])
+
+        # Display the formatted table
+        print(format_table(table, headers=["Metric"] + algorithms))
+        
+       
+
+        
+
+    # Adding cmd functionality to the code
+    # This method parses a command string and executes the corresponding method
+    # The string representing the command: (e.g., "setState 1 2 3 4 5 6 7 8 0")
+    def cmd(self, command_string):
+        # Parse and execute a command
+        # Ignore empty lines and comments
+        if not command_string or command_string.startswith('#'):
+            if command_string:
+                print(command_string)
+            return True
+
+        # Split command and arguments
+        parts = command_string.split()
+
+        try:
+            if parts[0] == 'setState':
+                # Expect one argument per tile after 'setState'
+                if len(parts) != self.size + 1:
+                    print("Error: invalid puzzle state")
+                    return False
+                state = [int(x) for x in parts[1:]]
+                return self.set_state(state)
+            
+            elif parts[0] == 'setSize':
+                if len(parts) != 3:
+                    print("Error: invalid command. Usage: setSize <rows> <cols>")
+                    return False
+                return self.set_size(int(parts[1]), int(parts[2]))
+
+            elif parts[0] == 'printState':
+                self.print_state()
+                return True
+            
+            elif parts[0] == 'move':
+                if len(parts) != 2:
+                    print("Error: Invalid move")
+                    return False
+                return self.move(parts[1])
+            
+            elif parts[0] == 'scrambleState':
+                if len(parts) != 2:
+                    print("Error: invalid command")
+                    return False
+                self.scramble_state(int(parts[1]))
+                return True
+            
+            elif parts[0] == 'scrambleMany':
+                if len(parts) < 3:
+                    print("Error: invalid command. Usage: scrambleMany <count> <moves> [seed=<n>] "
+                          "[mode=<walk|uniform>] [out=<file>]")
+                    return False
+                seed = None
+                mode = "walk"
+                out_file = None
+
+                for param in parts[3:]:
+                    if param.startswith('seed='):
+                        seed = int(param.split('=')[1])
+                    elif param.startswith('mode='):
+                        mode = param.split('=')[1]
+                    elif param.startswith('out='):
+                        out_file = param.split('=', 1)[1]
+
+                # One state per line, the format solveBatch reads
+                states = self.scramble_many(int(parts[1]), int(parts[2]), seed, mode)
+                lines = (' '.join(map(str, state)) + '\n' for state in states)
+                if out_file is None:
+                    sys.stdout.writelines(lines)
+                    return True
+                try:
+                    with open(out_file, 'w') as file:
+                        file.writelines(lines)
+                except OSError as e:
+                    print(f"Error: cannot write {out_file}: {e}")
+                    return False
+                print(f"Wrote {parts[1]} states to {out_file}")
+                return True
+
+            elif parts[0] == 'setSeed':
+                if len(parts) != 2:
+                    print("Error: invalid command")
+                    return False
+                self.set_seed(int(parts[1]))
+                return True
+            
+            elif parts[0] == 'solve':
+                if len(parts) > 1:
+                    if parts[1] == 'BFS':
+                        max_nodes = 1000
+                        engine = "python"
+
+                        for param in parts[2:]:
+                            if param.startswith('maxnodes='):
+                                max_nodes = int(param.split('=')[1])
+                            elif param.startswith('engine='):
+                                engine = param.split('=')[1]
+
+                        # Both engines give identical results, so they share cache entries
+                        return self.print_result(
+                            self.cached_solve("BFS", max_nodes, lambda: self.solve_bfs(max_nodes, engine=engine)))
+
+                    elif parts[1] == 'BiBFS':
+                        max_nodes = 1000
+                        if len(parts) > 2 and parts[2].startswith('maxnodes='):
+                            max_nodes = int(parts[2].split('=')[1])
+                        return self.print_result(
+                            self.cached_solve("BiBFS", max_nodes, lambda: self.solve_bibfs(max_nodes)))
+
+                    elif parts[1] == 'DFS':
+                        max_nodes = 1000
+                        depth_limit = 31
+
+                        for param in parts[2:]:
+                            if param.startswith('maxnodes='):
+                                max_nodes = int(param.split('=')[1])
+                            elif param.startswith('depthlimit='):
+                                depth_limit = int(param.split('=')[1])
+
+                        return self.print_result(self.solve_dfs(max_nodes, depth_limit))
+
+                    elif parts[1] == 'A*':
+                        heuristic = "h1"
+                        max_nodes = 1000
+                        queue = "heap"
+
+                        for param in parts[2:]:
+                            if param.startswith('heuristic='):
+                                heuristic = param.split('=')[1]
+                            elif param.startswith('maxnodes='):
+                                max_nodes = int(param.split('=')[1])
+                            elif param.startswith('queue='):
+                                queue = param.split('=')[1]
+
+                        # Both queues expand nodes in the same order, so they share cache entries
+                        return self.print_result(self.cached_solve(
+                            f"A*({heuristic})", max_nodes, lambda: self.solve_astar(heuristic, max_nodes, queue=queue)))
+
+                    elif parts[1] == 'WA*':
+                        heuristic = "h2"
+                        max_nodes = 1000
+                        weight = WA_STAR_WEIGHT
+                        queue = "heap"
+
+                        for param in parts[2:]:
+                            if param.startswith('heuristic='):
+                                heuristic = param.split('=')[1]
+                            elif param.startswith('maxnodes='):
+                                max_nodes = int(param.split('=')[1])
+                            elif param.startswith('weight='):
+                                weight = float(param.split('=')[1])
+                            elif param.startswith('queue='):
+                                queue = param.split('=')[1]
+
+                        return self.print_result(self.cached_solve(
+                            f"WA*({heuristic},w={weight:g})", max_nodes,
+                            lambda: self.solve_astar(heuristic, max_nodes, weight=weight, queue=queue)))
+
+                    elif parts[1] == 'ARA*':
+                        heuristic = "h2"
+                        max_nodes = 1000
+                        weight = 3.0
+                        step = 0.5
+                        time_limit = None
+
+                        for param in parts[2:]:
+                            if param.startswith('heuristic='):
+                                heuristic = param.split('=')[1]
+                            elif param.startswith('maxnodes='):
+                                max_nodes = int(param.split('=')[1])
+                            elif param.startswith('weight='):
+                                weight = float(param.split('=')[1])
+                            elif param.startswith('step='):
+                                step = float(param.split('=')[1])
+                            elif param.startswith('timelimit='):
+                                time_limit = float(param.split('=')[1])
+
+                        return self.print_result(self.solve_arastar(heuristic, weight, step, max_nodes, time_limit))
+
+                    elif parts[1] == 'IDA*':
+                        heuristic = "h1"
+                        max_nodes = 1000
+
+                        for param in parts[2:]:
+                            if param.startswith('heuristic='):
+                                heuristic = param.split('=')[1]
+                            elif param.startswith('maxnodes='):
+                                max_nodes = int(param.split('=')[1])
+
+                        return self.print_result(self.cached_solve(
+                            f"IDA*({heuristic})", max_nodes, lambda: self.solve_idastar(heuristic, max_nodes)))
+
+                    elif parts[1] == 'ORACLE':
+                        return self.print_result(self.solve_oracle())
+                    
+            
+            elif parts[0] == 'solveBatch':
+                if len(parts) < 2:
+                    print("Error: invalid command. Usage: solveBatch <infile> [algo=<name>] [heuristic=<h>] "
+                          "[maxnodes=<n>] [workers=<n>] [order=<input|completion>]")
+                    return False
+                algo = "A*"
+                heuristic = "h2"
+                max_nodes = 100000
+                workers = None
+                order = "input"
+
+                for param in parts[2:]:
+                    if param.startswith('algo='):
+                        algo = param.split('=')[1]
+                    elif param.startswith('heuristic='):
+                        heuristic = param.split('=')[1]
+                    elif param.startswith('maxnodes='):
+                        max_nodes = int(param.split('=')[1])
+                    elif param.startswith('workers='):
+                        workers = int(param.split('=')[1])
+                    elif param.startswith('order='):
+                        order = param.split('=')[1]
+
+                return self.solve_batch(parts[1], algo, heuristic, max_nodes, workers, order)
+
+            elif parts[0] == 'buildOracle':
+                return self.build_oracle()
+
+            elif parts[0] == 'setCache':
+                for param in parts[1:]:
+                    if param.startswith('size='):
+                        self.solution_cache.resize(int(param.split('=')[1]))
+                    elif param.startswith('symmetry='):
+                        value = param.split('=')[1]
+                        if value not in ('on', 'off'):
+                            print("Error: invalid command. Usage: setCache [size=<n>] [file=<path|none>] "
+                                  "[symmetry=<on|off>]")
+                            return False
+                        self.solution_cache.symmetry = value == 'on'
+                    elif param.startswith('file='):
+                        path = param.split('=', 1)[1]
+                        if path == 'none':
+                            self.solution_cache.close()
+                        else:
+                            import sqlite3
+
+                            try:
+                                self.solution_cache.open(path)
+                            except sqlite3.Error as e:
+                                print(f"Error: cannot open cache file {path}: {e}")
+                                return False
+                    else:
+                        print("Error: invalid command. Usage: setCache [size=<n>] [file=<path|none>] "
+                              "[symmetry=<on|off>]")
+                        return False
+                return True
+
+            elif parts[0] == 'cacheStats':
+                return self.cache_stats()
+
+            elif parts[0] == 'clearCache':
+                self.solution_cache.clear()
+                return True
+
+            elif parts[0] == 'profile':
+                # Options come first; the rest of the line is the command to profile
+                options = {"mode": "cprofile", "out": None, "sort": "cumulative", "limit": "25", "interval": "1"}
+                position = 1
+                while position < len(parts) and parts[position].split('=')[0] in options and '=' in parts[position]:
+                    name, value = parts[position].split('=', 1)
+                    options[name] = value
+                    position += 1
+                if position == len(parts):
+                    print("Error: invalid command. Usage: profile [mode=<cprofile|sample|phases>] [out=<file>] "
+                          "[sort=<key>] [limit=<n>] [interval=<ms>] <command...>")
+                    return False
+                return self.profile_command(' '.join(parts[position:]), options["mode"], options["out"],
+                                            options["sort"], int(options["limit"]), float(options["interval"]) / 1000)
+
+            elif parts[0] == 'benchmark':
+                out_file = "benchmark.json"
+                baseline_file = None
+                per_band = 5
+                seed = 0
+                solvers = None
+                timeout = 60.0
+                workers = 1
+                threshold = 10.0
+                track_memory = False
+                repeat = 3
+
+                for param in parts[1:]:
+                    if param.startswith('out='):
+                        out_file = param.split('=', 1)[1]
+                    elif param.startswith('baseline='):
+                        baseline_file = param.split('=', 1)[1]
+                    elif param.startswith('per_depth='):
+                        per_band = int(param.split('=')[1])
+                    elif param.startswith('seed='):
+                        seed = int(param.split('=')[1])
+                    elif param.startswith('solvers='):
+                        solvers = param.split('=', 1)[1].split(',')
+                    elif param.startswith('timeout='):
+                        timeout = float(param.split('=')[1])
+                    elif param.startswith('workers='):
+                        workers = int(param.split('=')[1])
+                    elif param.startswith('threshold='):
+                        threshold = float(param.split('=')[1])
+                    elif param.startswith('repeat='):
+                        repeat = int(param.split('=')[1])
+                    elif param.startswith('track_memory='):
+                        track_memory = param.split('=')[1] in ('1', 'on', 'true')
+
+                return self.run_benchmark(out_file, baseline_file, per_band, seed, solvers, timeout, workers,
+                                          threshold, track_memory, repeat)
+
+            elif parts[0] == 'effectiveBranchingFactor':
+                if len(parts) != 3:
+                    print("Error: invalid command. Usage: effectiveBranchingFactor <nodes_generated> <solution_depth>")
+                    return False
+    
+                nodes_generated = int(parts[1])
+                solution_depth = int(parts[2])
+                b_star = self.effective_branching_factor(nodes_generated, solution_depth)
+                print(f"Effective Branching Factor: {b_star}")
+                return True
+            
+
+            elif parts[0] == 'compareSearch':
+                bfs_maxnodes = 10000
+                dfs_depth_limit = 20000
+                dfs_maxnodes = 10000000000
+                astar_h1_maxnodes = 10000
+                astar_h2_maxnodes = 10000
+                astar_pdb_maxnodes = 10000
+                timeout = None
+                instances = 0
+                scramble_moves = 20
+                seed = 0
+                workers = None
+                track_memory = False
+                
+                for param in parts[1:]:
+                    if param.startswith('bfs_maxnodes='):
+                        bfs_maxnodes = int(param.split('=')[1])
+                    elif param.startswith('dfs_depth_limit='):
+                        dfs_depth_limit = int(param.split('=')[1])
+                    elif param.startswith('dfs_maxnodes='):
+                        dfs_maxnodes = int(param.split('=')[1])
+                    elif param.startswith('astar_h1_maxnodes='):
+                        astar_h1_maxnodes = int(param.split('=')[1])
+                    elif param.startswith('astar_h2_maxnodes='):
+                        astar_h2_maxnodes = int(param.split('=')[1])
+                    elif param.startswith('astar_pdb_maxnodes='):
+                        astar_pdb_maxnodes = int(param.split('=')[1])
+                    elif param.startswith('timeout='):
+                        timeout = float(param.split('=')[1])
+                    elif param.startswith('instances='):
+                        instances = int(param.split('=')[1])
+                    elif param.startswith('scramble='):
+                        scramble_moves = int(param.split('=')[1])
+                    elif param.startswith('seed='):
+                        seed = int(param.split('=')[1])
+                    elif param.startswith('workers='):
+                        workers = int(param.split('=')[1])
+                    elif param.startswith('track_memory='):
+                        track_memory = param.split('=')[1] in ('1', 'on', 'true')
+
+                if instances:
+                    self.compare_search_instances(
+                        instances=instances,
+                        scramble_moves=scramble_moves,
+                        seed=seed,
+                        bfs_maxnodes=bfs_maxnodes,
+                        dfs_depth_limit=dfs_depth_limit,
+                        dfs_maxnodes=dfs_maxnodes,
+                        astar_h1_maxnodes=astar_h1_maxnodes,
+                        astar_h2_maxnodes=astar_h2_maxnodes,
+                        astar_pdb_maxnodes=astar_pdb_maxnodes,
+                        timeout=timeout,
+                        workers=workers
+                    )
+                    return True
+                
+                # An unsolvable state would only exhaust every algorithm's budget
+                if not is_solvable(self.state, self.cols):
+                    print("Error: puzzle state is unsolvable")
+                    return False
+
+                results = self.compare_search_algorithms(
+                    bfs_maxnodes=bfs_maxnodes,
+                    dfs_depth_limit=dfs_depth_limit,
+                    dfs_maxnodes=dfs_maxnodes,
+                    astar_h1_maxnodes=astar_h1_maxnodes,
+                    astar_h2_maxnodes=astar_h2_maxnodes,
+                    astar_pdb_maxnodes=astar_pdb_maxnodes,
+                    timeout=timeout,
+                    track_memory=track_memory
+                )
+                
+                self.display_comparison_table(results)
+                return True
+            elif parts[0] == 'clear':
+                # Clear the terminal screen
+                os.system('cls' if os.name == 'nt' else 'clear')
+                return True
+        
+
+            
+            else:
+                print(f"Error: invalid command: {command_string}")
+                return False
+            
+        
+        except ValueError:
+            print(f"Error: invalid command: {command_string}")
+            return False
+        
+    # This method reads commands from files ('-' reads them from stdin)
+    def cmd_file(self, filename, quiet=False, json_lines=False):
+        if filename == '-':
+            # A client on a pipe or terminal may wait for each answer before sending the next command
+            self.run_commands(sys.stdin, quiet, json_lines, flush_each=not is_regular_file(sys.stdin))
+            return
+        try:
+            with open(filename, 'r') as file:
+                self.run_commands(file, quiet, json_lines)
+        except FileNotFoundError:
+            print(f"Error: File {filename} not found")
+
+    # This method runs commands from any iterable of lines (a file, stdin or a pipe), reading them one at a time.
+    # All output goes through one large buffered writer. quiet drops the echo of each command line, and json_lines
+    # replaces the normal output with one JSON object per command (command, status, nodes, length, path, time, error).
+    # flush_each flushes the writer after every command, for interactive clients reading answers from a pipe.
+    def run_commands(self, lines, quiet=False, json_lines=False, flush_each=False):
+        if json_lines:
+            import json
+        out = buffered_stdout()
+        with contextlib.redirect_stdout(out):
+            try:
+                for line in lines:
+                    line = line.strip()  # Remove leading/trailing whitespace
+                    try:
+                        if json_lines:
+                            if line and not line.startswith('#'):
+                                out.write(json.dumps(self._run_json_command(line)) + '\n')
+                            continue
+
+                        if not quiet:
+                            print(line)  # Echo the command or comment
+
+                        # Handle empty lines and comments
+                        if not line or line.startswith('#'):
+                            continue
+
+                        # Attempt to execute the command
+                        success = self.cmd(line)
+
+                        # Print error message if command execution failed
+                        if not success:
+                            print(f"Error: Command failed: {line}")
+                    finally:
+                        if flush_each:
+                            out.flush()  # Answer each command before waiting for the next one
+            finally:
+                out.flush()
+
+    # This helper method runs one command with its printed output captured and describes the outcome as a dict
+    def _run_json_command(self, line):
+        output = io.StringIO()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(output):
+            outcome = self.cmd(line)
+        record = {"command": line, "status": "ok" if outcome else "error", "nodes": None, "length": None,
+                  "path": None, "time": round(time.perf_counter() - start, 6)}
+        if isinstance(outcome, SearchResult):
+            record["nodes"] = outcome.nodes_created
+            if outcome.solved:
+                record["length"] = len(outcome.move_sequence)
+                record["path"] = outcome.move_sequence
+        if not outcome:
+            errors = [text for text in output.getvalue().splitlines() if text.startswith("Error")]
+            record["error"] = errors[-1] if errors else "command failed"
+        return record
+
+
+# The classic 3x3 puzzle (setSize can still resize an instance)
+class EightPuzzle(SlidingPuzzle):
+    def __init__(self):
+        super().__init__(3, 3)
+
+
+# Size of the buffer used when streaming command output (1 MiB)
+OUTPUT_BUFFER_SIZE = 1 << 20
+
+
+# Open a text writer on the process's stdout with a large buffer, so a long command stream costs few write
+# syscalls. Falls back to the current sys.stdout when it is not backed by a file descriptor.
+def buffered_stdout(buffer_size=OUTPUT_BUFFER_SIZE):
+    try:
+        fd = sys.stdout.fileno()
+    except (AttributeError, ValueError, io.UnsupportedOperation):
+        return sys.stdout
+    sys.stdout.flush()
+    return io.TextIOWrapper(open(fd, 'wb', buffering=buffer_size, closefd=False),
+                            encoding=sys.stdout.encoding, errors='replace')
+
+
+# Whether a file object reads from a regular file (rather than a pipe, socket or terminal)
+def is_regular_file(file):
+    try:
+        return stat.S_ISREG(os.fstat(file.fileno()).st_mode)
+    except (AttributeError, ValueError, OSError, io.UnsupportedOperation):
+        return False
+
+
+# Render rows as a grid table. tabulate is imported only when a table is actually printed, so importing this module
+# or running solver commands never pays for it; without tabulate the same grid layout is drawn in plain text.
+def format_table(rows, headers):
+    try:
+        from tabulate import tabulate
+    except ImportError:
+        pass
+    else:
+        return tabulate(rows, headers=headers, tablefmt="grid")
+
+    rows = [list(row) for row in rows]
+    cells = [[str(value) for value in row] for row in [headers] + rows]
+    widths = [max(len(row[i]) for row in cells) for i in range(len(headers))]
+    border = '+' + '+'.join('-' * (width + 2) for width in widths) + '+'
+    lines = [border]
+    for index, (texts, values) in enumerate(zip(cells, [headers] + rows)):
+        # Numbers are right-aligned and everything else left-aligned, as tabulate does
+        padded = [text.rjust(width) if isinstance(value, (int, float)) and not isinstance(value, bool)
+                  else text.ljust(width) for text, value, width in zip(texts, values, widths)]
+        lines.append('| ' + ' | '.join(padded) + ' |')
+        lines.append(border.replace('-', '=') if index == 0 else border)
+    return '\n'.join(lines)
+
+
+# Nearest-rank percentile of a non-empty list of numbers
+def percentile(values, p):
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+# Summarize one solver's benchmark runs (outcomes from run_solver_jobs, None for a timeout) on one instance set
+def benchmark_statistics(runs):
+    finished = [result for result in (outcome[0] for outcome in runs if outcome is not None)
+                if isinstance(result, SearchResult)]
+    solved = [result for result in finished if result.solved]
+    latencies = [result.wall_time for result in finished]
+    total_time = sum(latencies)
+    rss = [result.peak_rss for result in finished if result.peak_rss is not None]
+    traced = [result.peak_traced_memory for result in finished if result.peak_traced_memory is not None]
+    return {
+        "instances": len(runs),
+        "solved": len(solved),
+        "timeouts": sum(outcome is None for outcome in runs),
+        "nodes_mean": round(sum(r.nodes_created for r in solved) / len(solved), 1) if solved else None,
+        "length_mean": round(sum(len(r.move_sequence) for r in solved) / len(solved), 2) if solved else None,
+        "nodes_per_second": round(sum(r.nodes_generated for r in finished) / total_time) if total_time else None,
+        "latency_mean": round(total_time / len(latencies), 6) if latencies else None,
+        "latency_p50": round(percentile(latencies, 50), 6) if latencies else None,
+        "latency_p90": round(percentile(latencies, 90), 6) if latencies else None,
+        "latency_p99": round(percentile(latencies, 99), 6) if latencies else None,
+        "peak_rss_mb": round(max(rss) / 2 ** 20, 2) if rss else None,
+        "peak_traced_mb": round(max(traced) / 2 ** 20, 2) if traced else None,
+    }
+
+
+# Directory where worker processes dump cProfile stats while the profile command runs (inherited through fork)
+_child_profile_dir = None
+
+
+# Run fn under cProfile when the profile command asked for worker profiles, saving the stats for it to merge
+def _profiled_call(fn, *args):
+    if _child_profile_dir is None:
+        return fn(*args)
+    import cProfile
+    import tempfile
+
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(fn, *args)
+    finally:
+        handle, path = tempfile.mkstemp(suffix=".prof", dir=_child_profile_dir)
+        os.close(handle)
+        profiler.dump_stats(path)
+
+
+# Child process body for run_solver_jobs: solve one state and send back (result, seconds, report text)
+def _solver_job(connection, shape, state, algo, heuristic, max_nodes, depth_limit, keep_output, track_memory=False):
+    puzzle = SlidingPuzzle(*shape)
+    puzzle.set_state(state)
+    start = time.perf_counter()
+    result = _profiled_call(puzzle.run_solver, algo, heuristic, max_nodes, depth_limit, track_memory)
+    elapsed = time.perf_counter() - start
+    output = puzzle.format_result(result) if keep_output else ""
+    connection.send((result, elapsed, output + '\n' if output else ""))
+    connection.close()
+
+
+# Run solver jobs ((rows, cols), state, algo, heuristic, max nodes, depth limit, keep output[, track memory]) in
+# separate processes, at most `workers` at a time. Each job gets its own `timeout` in seconds; a job that runs
+# longer (or crashes) is terminated and reported as None. Outcomes are returned in job order.
+def run_solver_jobs(jobs, timeout=None, workers=None):
+    import multiprocessing
+    import multiprocessing.connection
+
+    workers = workers or os.cpu_count() or 1
+    outcomes = [None] * len(jobs)
+    pending = deque(enumerate(jobs))
+    running = {}  # receiving end of the pipe -> (job index, process, start time)
+
+    while pending or running:
+        while pending and len(running) < workers:
+            index, job = pending.popleft()
+            receiver, sender = multiprocessing.Pipe(duplex=False)
+            process = multiprocessing.Process(target=_solver_job, args=(sender,) + tuple(job))
+            process.start()
+            sender.close()
+            running[receiver] = (index, process, time.perf_counter())
+
+        wait_time = None
+        if timeout is not None:
+            first_deadline = min(start for _, _, start in running.values()) + timeout
+            wait_time = max(0.0, first_deadline - time.perf_counter())
+
+        for receiver in multiprocessing.connection.wait(list(running), wait_time):
+            index, process, _ = running.pop(receiver)
+            try:
+                outcomes[index] = receiver.recv()
+            except EOFError:
+                pass  # The job died without reporting (e.g. an invalid heuristic); leave it as None
+            receiver.close()
+            process.join()
+
+        if timeout is not None:
+            now = time.perf_counter()
+            for receiver, (index, process, start) in list(running.items()):
+                if now - start >= timeout:
+                    process.terminate()
+                    process.join()
+                    receiver.close()
+                    del running[receiver]
+
+    return outcomes
+
+
+# Worker for solveBatch: solves a chunk of (index, state) jobs in a separate process
+def _solve_batch_chunk(chunk, shape, algo, heuristic, max_nodes):
+    puzzle = SlidingPuzzle(*shape)
+    results = []
+    for index, state in chunk:
+        puzzle.set_state(list(state))
+        result = _profiled_call(puzzle.run_solver, algo, heuristic, max_nodes)
+        results.append((index, state, result))
+    return results
+
+
+# # Main method
+# # Only when the code is executed directly and not imported to another module
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Sliding puzzle command interpreter")
+    parser.add_argument("command_file", nargs="?",
+                        help="file of commands to run; '-' reads them from stdin (the default when stdin is a pipe)")
+    parser.add_argument("--quiet", action="store_true", help="do not echo each command before its output")
+    parser.add_argument("--json", action="store_true",
+                        help="print one JSON line per command (command, status, nodes, length, path, time)")
+    args = parser.parse_args()
+
+    # Create puzzle instance
+    puzzle = EightPuzzle()
+
+    command_file = args.command_file
+    if command_file is None and not sys.stdin.isatty():
+        command_file = '-'
+
+    # If no command file is given and stdin is a terminal, start interactive mode
+    if command_file is None:
+        print("Interactive mode. Enter commands (type 'quit' to exit):")
+        while True:
+            command = input("> ")
+            if command.lower() == 'quit':
+                break
+            puzzle.cmd(command)
+    # Otherwise stream the commands from the file or stdin
+    else:
+        puzzle.cmd_file(command_file, quiet=args.quiet, json_lines=args.json)
+
+# # Ensure the main method is called only when the script is run directly
+if __name__ == "__main__":
+   main()  
+    
+
+
+    
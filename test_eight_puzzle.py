@@ -0,0 +1,273 @@
+import itertools
+import json
+import os
+import select
+import subprocess
+import sys
+
+import pytest
+
+from eight_puzzle import (ORACLE_SIZE, ORACLE_UNREACHABLE, EightPuzzle, PhaseTimer, SlidingPuzzle, build_neighbor_table,
+                          is_solvable, load_distance_oracle, load_table_file, rank_state, transpose_state, unrank_state)
+
+
+@pytest.fixture(scope="module")
+def oracle():
+    return load_distance_oracle()
+
+
+# Seeded uniformly random solvable 3x3 states
+def random_states(count, seed=0):
+    return list(EightPuzzle().scramble_many(count, seed=seed, mode="uniform"))
+
+
+# Play a move sequence on a copy of the puzzle's board and check that it reaches the goal
+def reaches_goal(state, move_sequence):
+    puzzle = EightPuzzle()
+    puzzle.set_state(list(state))
+    return all(puzzle.move(move) for move in move_sequence) and puzzle.state == puzzle.geometry.goal_state
+
+
+# A*(pdb) used to return 24 moves here (optimal 22) because the pattern databases were inconsistent
+def test_astar_pdb_is_optimal_on_known_regression(oracle):
+    puzzle = EightPuzzle()
+    puzzle.set_state([7, 8, 1, 5, 0, 2, 3, 6, 4])
+    result = puzzle.solve_astar("pdb", max_nodes=200000)
+    assert len(result.move_sequence) == oracle[rank_state(puzzle.state)] == 22
+
+
+def test_astar_pdb_matches_oracle(oracle):
+    puzzle = EightPuzzle()
+    for state in random_states(300):
+        puzzle.set_state(state)
+        result = puzzle.solve_astar("pdb", max_nodes=200000)
+        assert len(result.move_sequence) == oracle[rank_state(state)], state
+        assert reaches_goal(state, result.move_sequence)
+
+
+def test_solve_batch_reports_every_state_in_input_order(tmp_path, capsys):
+    states = random_states(20, seed=1)
+    infile = tmp_path / "states.txt"
+    infile.write_text(''.join(' '.join(map(str, state)) + '\n' for state in states))
+    assert EightPuzzle().solve_batch(str(infile), workers=4)
+    lines = capsys.readouterr().out.splitlines()
+    assert [line.split(']')[0] for line in lines[:-1]] == [f"[{index}" for index in range(1, 21)]
+    assert lines[-1] == "Solved 20 of 20 states"
+
+
+def test_set_size_rejects_oversized_boards():
+    puzzle = EightPuzzle()
+    assert not puzzle.set_size(60, 60)
+    assert not puzzle.set_size(2, 20000)
+    assert puzzle.size == 9
+    assert puzzle.set_size(8, 8) and puzzle.size == 64
+
+
+# A state that differs from its transpose, and the transpose; both map to one cache entry
+def transposed_pair():
+    walks = EightPuzzle().scramble_many(50, 12, seed=2)
+    state = next(state for state in walks if transpose_state(state, 3) != state)
+    return state, transpose_state(state, 3)
+
+
+def cached_solve(puzzle, algorithm, max_nodes):
+    if algorithm == "BFS":
+        return puzzle.cached_solve(algorithm, max_nodes, lambda: puzzle.solve_bfs(max_nodes))
+    return puzzle.cached_solve(algorithm, max_nodes, lambda: puzzle.solve_astar("h2", max_nodes))
+
+
+@pytest.mark.parametrize("algorithm", ["BFS", "A*(h2)"])
+@pytest.mark.parametrize("orientation", [0, 1])
+def test_cache_hit_in_searched_orientation_matches_solver(algorithm, orientation):
+    state = transposed_pair()[orientation]
+    puzzle = EightPuzzle()
+    puzzle.set_state(state)
+    searched = cached_solve(puzzle, algorithm, 100000)
+    hit = cached_solve(puzzle, algorithm, 100000)
+    assert puzzle.solution_cache.hits == 1
+    assert hit.move_sequence == searched.move_sequence
+    assert (hit.nodes_expanded, hit.nodes_generated) == (searched.nodes_expanded, searched.nodes_generated)
+    # A budget the solver could not finish within is a miss, and the solver fails as it would uncached
+    assert not cached_solve(puzzle, algorithm, searched.nodes_expanded - 1)
+
+
+@pytest.mark.parametrize("orientation", [0, 1])
+def test_cache_hit_through_transpose_only_with_symmetry(orientation):
+    first, second = transposed_pair()[orientation], transposed_pair()[1 - orientation]
+    puzzle = EightPuzzle()
+    puzzle.set_state(first)
+    searched = cached_solve(puzzle, "BFS", 100000)
+    puzzle.set_state(second)
+    assert cached_solve(puzzle, "BFS", 100000).nodes_expanded is not None  # Folding is off by default
+    assert puzzle.solution_cache.hits == 0
+
+    puzzle = EightPuzzle()
+    puzzle.solution_cache.symmetry = True
+    puzzle.set_state(first)
+    searched = cached_solve(puzzle, "BFS", 100000)
+    puzzle.set_state(second)
+    hit = cached_solve(puzzle, "BFS", 100000)
+    assert puzzle.solution_cache.hits == 1
+    assert len(hit.move_sequence) == len(searched.move_sequence)
+    assert reaches_goal(second, hit.move_sequence)
+    assert hit.nodes_expanded is None and hit.nodes_generated is None
+    assert "Nodes created during search: unknown" in hit.report()
+    # The budget check still applies to transposed hits
+    assert not cached_solve(puzzle, "BFS", 1)
+
+
+# ARA*(pdb) used to report a bound of 1 for a 25-move solution here (optimal 23)
+def test_arastar_pdb_bound_is_honest_on_known_regression(oracle):
+    puzzle = EightPuzzle()
+    puzzle.set_state([2, 6, 1, 3, 5, 0, 8, 4, 7])
+    result = puzzle.solve_arastar("pdb", max_nodes=100000)
+    assert result.suboptimality_bound == 1
+    assert len(result.move_sequence) == oracle[rank_state(puzzle.state)] == 23
+
+
+@pytest.mark.parametrize("heuristic", ["h2", "pdb"])
+@pytest.mark.parametrize("max_nodes", [300, 100000])
+def test_arastar_bound_holds_against_oracle(oracle, heuristic, max_nodes):
+    puzzle = EightPuzzle()
+    for state in random_states(100, seed=3):
+        puzzle.set_state(state)
+        result = puzzle.solve_arastar(heuristic, max_nodes=max_nodes)
+        if result:
+            assert len(result.move_sequence) <= result.suboptimality_bound * oracle[rank_state(state)] + 1e-9, state
+
+
+# Best-g pruning and the tie-breaking order must keep A* optimal with every heuristic and both open lists
+@pytest.mark.parametrize("heuristic", ["h1", "h2", "pdb"])
+@pytest.mark.parametrize("queue", ["heap", "bucket"])
+def test_astar_queues_match_oracle(oracle, heuristic, queue):
+    puzzle = EightPuzzle()
+    for state in random_states(30, seed=4):
+        puzzle.set_state(state)
+        result = puzzle.solve_astar(heuristic, max_nodes=200000, queue=queue)
+        assert len(result.move_sequence) == oracle[rank_state(state)], state
+
+
+# The instrumented copies that phase profiles run must search exactly like the solvers they are compiled from
+@pytest.mark.parametrize("solve", [
+    lambda puzzle: puzzle.solve_bfs(100000),
+    lambda puzzle: puzzle.solve_dfs(5000, 31),
+    lambda puzzle: puzzle.solve_astar("h2", 100000),
+    lambda puzzle: puzzle.solve_astar("pdb", 100000, weight=2, queue="bucket"),
+])
+def test_phase_timed_solvers_match_untimed(solve):
+    puzzle = EightPuzzle()
+    for state in EightPuzzle().scramble_many(10, 14, seed=5):
+        puzzle.set_state(state)
+        plain = solve(puzzle)
+        puzzle.phase_timer = PhaseTimer()
+        timed = solve(puzzle)
+        puzzle.phase_timer = None
+        assert (timed.move_sequence, timed.nodes_expanded, timed.nodes_generated) == \
+            (plain.move_sequence, plain.nodes_expanded, plain.nodes_generated)
+        assert timed.solved == plain.solved
+
+
+@pytest.mark.parametrize("heuristic", ["h2", "pdb"])
+def test_idastar_matches_oracle(oracle, heuristic):
+    puzzle = EightPuzzle()
+    for state in random_states(30, seed=6):
+        puzzle.set_state(state)
+        result = puzzle.solve_idastar(heuristic, max_nodes=10000000)
+        assert len(result.move_sequence) == oracle[rank_state(state)], state
+        assert reaches_goal(state, result.move_sequence)
+
+
+# Rebuilding a table file replaces it instead of rewriting it, so an existing mapping keeps the old contents
+def test_load_table_file_replaces_instead_of_truncating(tmp_path):
+    path = str(tmp_path / "table.bin")
+    old = load_table_file(path, 4, lambda: b"\x01\x02\x03\x04")
+    new = load_table_file(path, 4, lambda: b"\x05\x06\x07\x08", rebuild=True)
+    assert bytes(old) == b"\x01\x02\x03\x04"
+    assert bytes(new) == b"\x05\x06\x07\x08"
+    assert os.listdir(tmp_path) == ["table.bin"]
+
+
+def test_bibfs_matches_oracle(oracle):
+    puzzle = EightPuzzle()
+    for state in random_states(50, seed=7):
+        puzzle.set_state(state)
+        result = puzzle.solve_bibfs(max_nodes=200000)
+        assert len(result.move_sequence) == oracle[rank_state(state)], state
+        assert reaches_goal(state, result.move_sequence)
+
+
+# The parity check must agree with reachability from the goal for every 3x3 permutation
+def test_is_solvable_matches_oracle_for_every_permutation(oracle):
+    for rank in range(ORACLE_SIZE):
+        assert is_solvable(unrank_state(rank)) == (oracle[rank] != ORACLE_UNREACHABLE), unrank_state(rank)
+
+
+# ... and for every 2x3 permutation, against a BFS from the goal over the whole board
+def test_is_solvable_matches_reachability_on_2x3():
+    neighbors = build_neighbor_table(2, 3)
+    goal = tuple(range(6))
+    reachable = {goal}
+    layer = [goal]
+    while layer:
+        next_layer = []
+        for state in layer:
+            blank_index = state.index(0)
+            for _, new_blank_index in neighbors[blank_index]:
+                board = list(state)
+                board[blank_index], board[new_blank_index] = board[new_blank_index], 0
+                board = tuple(board)
+                if board not in reachable:
+                    reachable.add(board)
+                    next_layer.append(board)
+        layer = next_layer
+    assert len(reachable) == 360
+    for state in itertools.permutations(range(6)):
+        assert is_solvable(list(state), cols=3) == (state in reachable), state
+
+
+# A client on a pipe gets each answer before it sends the next command
+def test_piped_commands_are_answered_one_at_a_time():
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "eight_puzzle.py")
+    process = subprocess.Popen([sys.executable, script, "--json"], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                               text=True)
+    try:
+        for command in ("setState 1 0 2 3 4 5 6 7 8", "solve BFS"):
+            process.stdin.write(command + "\n")
+            process.stdin.flush()
+            ready, _, _ = select.select([process.stdout], [], [], 10)
+            assert ready, command
+            assert json.loads(process.stdout.readline())["command"] == command
+    finally:
+        process.stdin.close()
+        process.wait(10)
+
+
+# The NumPy BFS engine must reproduce the queue-based BFS exactly, including where a maxnodes cutoff stops it
+@pytest.mark.parametrize("shape, moves", [((3, 3), 40), ((2, 3), 30), ((4, 4), 14)])
+def test_numpy_bfs_matches_python_bfs(shape, moves):
+    pytest.importorskip("numpy")
+    puzzle = SlidingPuzzle(*shape)
+    for state in puzzle.scramble_many(10, moves, seed=8):
+        puzzle.set_state(state)
+        for max_nodes in (1, 2, 3, 7, 50, 1000, 200000):
+            expected = puzzle.solve_bfs(max_nodes)
+            actual = puzzle.solve_bfs(max_nodes, engine="numpy")
+            fields = ("solved", "move_sequence", "nodes_expanded", "nodes_generated", "duplicates_skipped",
+                      "peak_frontier")
+            assert [getattr(actual, field) for field in fields] == [getattr(expected, field) for field in fields], \
+                (state, max_nodes)
+
+
+@pytest.mark.parametrize("shape", [(3, 3), (2, 3), (4, 4)])
+def test_uniform_scrambles_are_solvable_permutations(shape):
+    puzzle = SlidingPuzzle(*shape)
+    states = list(puzzle.scramble_many(500, seed=9, mode="uniform"))
+    assert len(states) == 500
+    for state in states:
+        assert sorted(state) == puzzle.geometry.goal_state
+        assert is_solvable(state, cols=shape[1]), state
+    assert puzzle.state == puzzle.geometry.goal_state  # The board itself is left alone
+
+
+def test_uniform_scrambles_are_reachable(oracle):
+    assert all(oracle[rank_state(state)] != ORACLE_UNREACHABLE for state in random_states(1000, seed=10))